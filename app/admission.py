@@ -0,0 +1,279 @@
+import asyncio
+import hashlib
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config import env_flag
+import app.metrics as metrics
+
+# Per-client token buckets: RATE_LIMIT_RPS requests per second on average,
+# with bursts of up to RATE_LIMIT_BURST; 0 turns rate limiting off
+RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS", 0))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", 0)) or max(RATE_LIMIT_RPS * 2, 1)
+# memory (each worker counts on its own) or redis (shared by every worker and host)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_URL = os.getenv("RATE_LIMIT_URL", "redis://localhost:6379/0")
+# Clients sending this header are limited by its value (an API key), others by address
+RATE_LIMIT_KEY_HEADER = os.getenv("RATE_LIMIT_KEY_HEADER", "X-API-Key")
+# Take the client address from X-Forwarded-For; only safe behind a proxy that sets it
+RATE_LIMIT_TRUST_PROXY = env_flag("RATE_LIMIT_TRUST_PROXY", False)
+# Buckets kept by the memory backend; the least recently seen clients are forgotten first
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", 100000))
+
+# Requests one worker serves at once; 0 turns admission control off. Size it
+# to the connection pool (DB_POOL_SIZE + DB_MAX_OVERFLOW) plus some headroom
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", 0))
+# Requests allowed to wait for a slot, and for how long, before they get 503
+MAX_QUEUED_REQUESTS = int(os.getenv("MAX_QUEUED_REQUESTS", 100))
+ADMISSION_TIMEOUT_MS = float(os.getenv("ADMISSION_TIMEOUT_MS", 1000))
+
+# Health checks and metrics scrapes must get through an overload
+EXEMPT_PATH_PREFIXES = ("/api/system/", "/metrics")
+
+REQUESTS_SHED = metrics.Counter(
+    "http_requests_shed_total", "Requests turned away by rate limiting or admission control", ("reason",),
+)
+ADMISSION_WAIT = metrics.Histogram(
+    "admission_queue_wait_seconds", "Time requests waited for a free slot before being served",
+    (), metrics.LATENCY_BUCKETS,
+)
+RATE_LIMIT_ERRORS = metrics.Counter(
+    "rate_limit_backend_errors_total", "Rate limit checks let through because the shared backend failed", (),
+)
+metrics.REGISTRY.extend([REQUESTS_SHED, ADMISSION_WAIT, RATE_LIMIT_ERRORS])
+
+class TokenBuckets:
+    """
+    In-process token buckets, one per client.
+
+    A bucket holds up to burst tokens and refills at rate tokens per second;
+    each request takes one. Only the event loop touches the buckets, so no
+    lock is needed.
+
+    Args:
+        rate (float): Requests per second allowed on average
+        burst (float): Requests allowed back to back after a quiet period
+        max_clients (int): Buckets kept before the least recently used is dropped
+    """
+
+    name = "memory"
+
+    def __init__(self, rate: float = RATE_LIMIT_RPS, burst: float = RATE_LIMIT_BURST,
+                 max_clients: int = RATE_LIMIT_MAX_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        # client -> [tokens, updated_at]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    async def acquire(self, client: str) -> float:
+        """Take a token; returns 0 if the request may proceed, else seconds until it may"""
+        now = time.monotonic()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = [self.burst, now]
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / self.rate
+
+# Refill and take a token atomically; returns the wait in seconds as a string
+# (Lua numbers would be truncated to integers on the way back)
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+class RedisTokenBuckets(TokenBuckets):
+    """
+    Token buckets shared by every worker through a server speaking the Redis protocol.
+
+    Each check is one round trip running a Lua script, so concurrent workers
+    never double-spend a token. If the server cannot be reached the request
+    is let through (and counted) rather than failed.
+    """
+
+    name = "redis"
+
+    def __init__(self, rate: float = RATE_LIMIT_RPS, burst: float = RATE_LIMIT_BURST,
+                 url: str = RATE_LIMIT_URL, client=None, prefix: str = "ratelimit:"):
+        super().__init__(rate, burst)
+        if client is None:
+            try:
+                import redis.asyncio
+            except ImportError:
+                raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package")
+            client = redis.asyncio.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    async def acquire(self, client: str) -> float:
+        try:
+            wait = await self.client.eval(
+                _TOKEN_BUCKET_SCRIPT, 1, self.prefix + client, self.rate, self.burst, time.time(),
+            )
+        except Exception:
+            RATE_LIMIT_ERRORS.inc()
+            return 0.0
+        return float(wait)
+
+class ConcurrencyLimiter:
+    """
+    Cap on the requests a worker serves at once, with a bounded FIFO queue.
+
+    Requests over the cap wait for a slot; when max_queued are already
+    waiting, or a slot does not free up within timeout seconds, the request
+    is shed so the pool and the database are not buried under queued work.
+
+    Args:
+        max_concurrent (int): Requests served at once
+        max_queued (int): Requests allowed to wait for a slot
+        timeout (float): Seconds a request may wait for a slot
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_REQUESTS, max_queued: int = MAX_QUEUED_REQUESTS,
+                 timeout: float = ADMISSION_TIMEOUT_MS / 1000):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: deque = deque()
+
+    async def acquire(self) -> Optional[str]:
+        """Take a slot; returns None once admitted, else why the request was shed"""
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            return None
+        if len(self._waiters) >= self.max_queued:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # The slot was handed over just as the wait timed out; take it
+                ADMISSION_WAIT.observe(time.perf_counter() - queued_at)
+                return None
+            self._waiters.remove(waiter)
+            return "queue_timeout"
+        except asyncio.CancelledError:
+            if waiter.done():
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        ADMISSION_WAIT.observe(time.perf_counter() - queued_at)
+        return None
+
+    def release(self):
+        # Hand the slot straight to the longest waiter, so active stays the same
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+def client_key(scope: Scope) -> str:
+    """Identify the client of a request: its API key if it sent one, else its address"""
+    headers = Headers(scope=scope)
+    api_key = headers.get(RATE_LIMIT_KEY_HEADER)
+    if api_key:
+        # Hashed so keys never end up in Redis key names or memory dumps
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:32]
+    if RATE_LIMIT_TRUST_PROXY and headers.get("x-forwarded-for"):
+        return "ip:" + headers["x-forwarded-for"].split(",")[0].strip()
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+def build_rate_limiter(backend: str = RATE_LIMIT_BACKEND) -> Optional[TokenBuckets]:
+    """
+    Create the rate limiter selected by RATE_LIMIT_BACKEND.
+
+    Returns:
+        Optional[TokenBuckets]: The limiter, or None when RATE_LIMIT_RPS is 0
+    """
+    if RATE_LIMIT_RPS <= 0:
+        return None
+    if backend == "memory":
+        return TokenBuckets()
+    if backend == "redis":
+        return RedisTokenBuckets()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+
+class AdmissionMiddleware:
+    """
+    Turn away requests before they reach the routes when a client or the worker is over its limit.
+
+    A client over its rate gets 429 and a worker at its concurrency cap with
+    a full queue gets 503; both carry Retry-After. Paths in
+    EXEMPT_PATH_PREFIXES are never limited.
+    """
+
+    def __init__(self, app: ASGIApp, rate_limiter: Optional[TokenBuckets] = None,
+                 concurrency: Optional[ConcurrencyLimiter] = None):
+        self.app = app
+        self.rate_limiter = rate_limiter if rate_limiter is not None else build_rate_limiter()
+        if concurrency is None and MAX_CONCURRENT_REQUESTS > 0:
+            concurrency = ConcurrencyLimiter()
+        self.concurrency = concurrency
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate_limiter is not None:
+            wait = await self.rate_limiter.acquire(client_key(scope))
+            if wait > 0:
+                REQUESTS_SHED.inc("rate_limited")
+                await _reject(429, "Rate limit exceeded", wait, scope, receive, send)
+                return
+
+        if self.concurrency is None:
+            await self.app(scope, receive, send)
+            return
+        reason = await self.concurrency.acquire()
+        if reason is not None:
+            REQUESTS_SHED.inc(reason)
+            await _reject(503, "Server overloaded", 1, scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.concurrency.release()
+
+async def _reject(status_code: int, detail: str, retry_after: float, scope: Scope, receive: Receive, send: Send):
+    response = JSONResponse(
+        {"detail": detail}, status_code=status_code, headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+    )
+    await response(scope, receive, send)
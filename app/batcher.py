@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import os
+import time
+from typing import List, Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+from app.config import env_flag
+from app.database import DB_ASYNC, get_async_sessionmaker, get_sessionmaker
+from app.models.item import Item
+from app.schemas.item import ItemCreate
+import app.crud.aio as crud
+import app.metrics as metrics
+
+# Group commit for POST /api/items/: concurrent creates are written together
+# with one multi-row INSERT and one commit
+BATCH_CREATES = env_flag("BATCH_CREATES", False)
+# Largest batch, and how long the first item of a batch may wait for company
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 100))
+BATCH_MAX_DELAY_MS = float(os.getenv("BATCH_MAX_DELAY_MS", 5))
+# Creates allowed to wait in the queue before new ones are turned away with 503
+BATCH_MAX_PENDING = int(os.getenv("BATCH_MAX_PENDING", 5000))
+
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+logger = logging.getLogger("app.batcher")
+
+BATCH_SIZE = metrics.Histogram(
+    "item_create_batch_size", "Items written per group commit", ("outcome",), BATCH_SIZE_BUCKETS,
+)
+BATCH_QUEUE_WAIT = metrics.Histogram(
+    "item_create_queue_wait_seconds", "Time a create waited in the queue before its batch was written",
+    (), metrics.LATENCY_BUCKETS,
+)
+BATCH_REJECTED = metrics.Counter(
+    "item_create_rejected_total", "Creates turned away because the batch queue was full", (),
+)
+metrics.REGISTRY.extend([BATCH_SIZE, BATCH_QUEUE_WAIT, BATCH_REJECTED])
+
+class BatcherOverloaded(Exception):
+    """The create queue is full or the batcher is shutting down."""
+
+# One queued create: the item, the caller's future and when it was queued
+_Pending = Tuple[ItemCreate, asyncio.Future, float]
+
+class CreateBatcher:
+    """
+    Gather concurrent item creates into micro-batches written with one commit.
+
+    A batch is flushed when it reaches max_size items or max_delay seconds
+    after its first item arrived, whichever comes first. While a batch is
+    being written the next one keeps filling, so batches grow with the load.
+    If a batch fails, its items are retried one by one so a single bad row
+    does not fail the others.
+
+    Args:
+        max_size (int): Largest number of items per INSERT
+        max_delay (float): Seconds the first item of a batch may wait
+        max_pending (int): Queue length beyond which submit raises BatcherOverloaded
+    """
+
+    def __init__(self, max_size: int = BATCH_MAX_SIZE, max_delay: float = BATCH_MAX_DELAY_MS / 1000,
+                 max_pending: int = BATCH_MAX_PENDING):
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._accepting = False
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    def start(self):
+        """Start the writer task on the running event loop"""
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._accepting = True
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop accepting creates, write everything already queued and stop the writer"""
+        if self._task is None:
+            return
+        self._accepting = False
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, item: ItemCreate) -> Item:
+        """
+        Queue an item for the next batch and wait until it is committed.
+
+        Raises:
+            BatcherOverloaded: The queue is full or the batcher is stopping
+
+        Returns:
+            Item: The created item with its assigned ID
+        """
+        if not self._accepting:
+            raise BatcherOverloaded("Batcher is not accepting creates")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            BATCH_REJECTED.inc()
+            raise BatcherOverloaded("Too many creates waiting to be written")
+        return await future
+
+    async def _next_batch(self) -> List[_Pending]:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_delay
+        while len(batch) < self.max_size:
+            # Take whatever is already queued without waiting
+            while len(batch) < self.max_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            remaining = deadline - time.perf_counter()
+            if len(batch) >= self.max_size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                logger.exception("Group commit of %d items failed", len(batch))
+                # Fail every caller still waiting rather than leave it hanging
+                for _, future, _ in batch:
+                    _resolve(future, error=e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[_Pending]):
+        flushed_at = time.perf_counter()
+        for _, _, queued_at in batch:
+            BATCH_QUEUE_WAIT.observe(flushed_at - queued_at)
+
+        items = [item for item, _, _ in batch]
+        try:
+            created = await self._write(items)
+        except SQLAlchemyError as e:
+            BATCH_SIZE.observe(len(batch), "failed")
+            if len(batch) == 1:
+                _resolve(batch[0][1], error=e)
+                return
+            # Find the offending rows by writing each item on its own
+            for item, future, _ in batch:
+                try:
+                    _resolve(future, result=(await self._write([item]))[0])
+                except SQLAlchemyError as item_error:
+                    _resolve(future, error=item_error)
+            return
+
+        BATCH_SIZE.observe(len(batch), "committed")
+        for (_, future, _), db_item in zip(batch, created):
+            _resolve(future, result=db_item)
+
+    async def _write(self, items: List[ItemCreate]) -> List[Item]:
+        """Insert the items with one multi-row INSERT and one commit"""
+        if DB_ASYNC:
+            async with get_async_sessionmaker()() as db:
+                return await crud.create_items(db=db, items=items)
+        db = get_sessionmaker()()
+        try:
+            return await crud.create_items(db=db, items=items)
+        finally:
+            await run_in_threadpool(db.close)
+
+def _resolve(future: asyncio.Future, result=None, error: Optional[BaseException] = None):
+    # The caller may have gone away (client disconnect) and cancelled its future
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+# Batcher used by POST /api/items/ when BATCH_CREATES is set; started by the app lifespan
+create_batcher = CreateBatcher()
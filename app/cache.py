@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import app.config  # noqa: F401  (loads .env)
+
+# Item cache configuration
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "none").lower()
+CACHE_MAX_ITEMS = int(os.getenv("CACHE_MAX_ITEMS", 10000))
+CACHE_TTL = float(os.getenv("CACHE_TTL", 60))
+CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+
+class ItemCache:
+    """
+    Base class for item caches. Values are plain dicts of item fields.
+
+    This base implementation caches nothing, which is what CACHE_BACKEND=none uses.
+    """
+
+    name = "none"
+
+    def __init__(self):
+        self._counter_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _count(self, counter: str):
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        return None
+
+    def set(self, item_id: int, value: Dict[str, Any]):
+        pass
+
+    def delete(self, item_id: int):
+        pass
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            return {
+                "backend": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "errors": self.errors,
+            }
+
+class MemoryCache(ItemCache):
+    """In-process LRU cache with a size bound and per-entry TTL."""
+
+    name = "memory"
+
+    def __init__(self, max_items: int = CACHE_MAX_ITEMS, ttl: float = CACHE_TTL):
+        super().__init__()
+        self.max_items = max_items
+        self.ttl = ttl
+        # Share the counter lock so hit/miss counts stay consistent with the entries
+        self._lock = self._counter_lock
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(item_id)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(item_id)
+                    self.hits += 1
+                    return value
+                del self._entries[item_id]
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+    def set(self, item_id: int, value: Dict[str, Any]):
+        with self._lock:
+            self._entries[item_id] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(item_id)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, item_id: int):
+        with self._lock:
+            self._entries.pop(item_id, None)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        with self._lock:
+            stats.update({"size": len(self._entries), "max_items": self.max_items, "ttl": self.ttl})
+        return stats
+
+class RedisCache(ItemCache):
+    """
+    Cache shared between workers through any server speaking the Redis protocol.
+
+    The client only needs get/set/delete, so a stand-in object can be passed
+    instead of a real redis.Redis client. Cache errors count as misses and
+    never fail the request.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = CACHE_URL, ttl: float = CACHE_TTL, client=None, prefix: str = "item:"):
+        super().__init__()
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, item_id: int) -> str:
+        return f"{self.prefix}{item_id}"
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self.client.get(self._key(item_id))
+        except Exception:
+            self._count("errors")
+            raw = None
+        if raw is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return json.loads(raw)
+
+    def set(self, item_id: int, value: Dict[str, Any]):
+        try:
+            self.client.set(self._key(item_id), json.dumps(value), px=int(self.ttl * 1000))
+        except Exception:
+            self._count("errors")
+
+    def delete(self, item_id: int):
+        try:
+            self.client.delete(self._key(item_id))
+        except Exception:
+            self._count("errors")
+
+def item_to_dict(item) -> Dict[str, Any]:
+    """Convert an Item model to the dict stored in the cache."""
+    return {
+        "id": item.id,
+        "title": item.title,
+        "description": item.description,
+        "completed": item.completed,
+    }
+
+def build_cache(backend: str = CACHE_BACKEND) -> ItemCache:
+    """
+    Create the item cache selected by CACHE_BACKEND.
+
+    Args:
+        backend (str): "none", "memory" or "redis"
+
+    Returns:
+        ItemCache: The configured cache
+    """
+    if backend == "memory":
+        return MemoryCache()
+    if backend == "redis":
+        return RedisCache()
+    if backend == "none":
+        return ItemCache()
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+
+# Cache used by app.crud; replace it to plug in another backend
+item_cache = build_cache()
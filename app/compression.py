@@ -0,0 +1,179 @@
+import os
+import zlib
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+import app.config  # noqa: F401  (loads .env)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+# Response compression settings
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+
+# Content types that are already compressed or must not be buffered
+EXCLUDED_CONTENT_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip", "text/event-stream")
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the response encoding from an Accept-Encoding header.
+
+    Brotli is preferred over gzip at equal quality, and only offered when
+    the brotli package is installed.
+
+    Args:
+        accept_encoding (str): Raw Accept-Encoding header value
+
+    Returns:
+        Optional[str]: "br", "gzip" or None for an uncompressed response
+    """
+    supported = ("br", "gzip") if brotli is not None else ("gzip",)
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in supported:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+class _Compressor:
+    """Incremental gzip or brotli compressor."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits=31 writes the gzip container
+            self._zlib = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        """Compress a chunk; flush emits everything buffered so far so the client can decode it"""
+        if self.encoding == "br":
+            return self._brotli.process(data) + (self._brotli.flush() if flush else b"")
+        return self._zlib.compress(data) + (self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else b"")
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+class CompressionMiddleware:
+    """
+    Compress responses with gzip or brotli, as negotiated with the client.
+
+    Responses with a Content-Length below minimum_size are sent as-is.
+    Responses without one (streaming exports) are compressed chunk by chunk
+    and flushed after each one, so the client receives data as it is
+    produced. Responses that already have a Content-Encoding, have no body
+    (204/304) or carry an excluded content type pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressionResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start_message: Optional[Message] = None
+        # "passthrough", "buffer" (known length) or "stream"; decided on the first body message
+        self.mode: Optional[str] = None
+        self.compressor: Optional[_Compressor] = None
+        self.buffer = bytearray()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _choose_mode(self, headers: Headers) -> str:
+        if self.start_message["status"] in (204, 304) or "content-encoding" in headers:
+            return "passthrough"
+        if headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES):
+            return "passthrough"
+        content_length = headers.get("content-length")
+        if content_length is None:
+            return "stream"
+        return "buffer" if int(content_length) >= self.minimum_size else "passthrough"
+
+    def _set_headers(self, content_length: Optional[int]):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        # The compressed bytes differ from the identity representation, so the validator is weak
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def send_compressed(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body message shows what kind of response this is
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode is None:
+            self.mode = self._choose_mode(Headers(raw=self.start_message["headers"]))
+            if self.mode == "passthrough":
+                await self.send(self.start_message)
+            else:
+                self.compressor = _Compressor(self.encoding)
+            if self.mode == "stream":
+                self._set_headers(None)
+                await self.send(self.start_message)
+
+        if self.mode == "passthrough":
+            await self.send(message)
+        elif self.mode == "buffer":
+            # The whole body is already in memory upstream; compress it in one go
+            self.buffer += body
+            if not more_body:
+                body = self.compressor.finish(bytes(self.buffer))
+                self._set_headers(len(body))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+        else:
+            body = self.compressor.compress(body, flush=True) if more_body else self.compressor.finish(body)
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
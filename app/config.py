@@ -0,0 +1,13 @@
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from .env once for the whole app;
+# modules read their settings with os.getenv after importing this one
+load_dotenv()
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean setting such as DB_ASYNC=true from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes")
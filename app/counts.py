@@ -0,0 +1,71 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+import app.config  # noqa: F401  (loads .env)
+
+# Seconds an approximate item count is reused before it is counted again
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", 30))
+# Approximate counts of the whole table come from MySQL's table statistics
+# (no table scan) when they report at least this many rows
+COUNT_ESTIMATE_MIN_ROWS = int(os.getenv("COUNT_ESTIMATE_MIN_ROWS", 100000))
+
+class ItemCounts:
+    """
+    Approximate item counts, keyed by the completed filter (None for all items).
+
+    A count is taken with SELECT COUNT(*) (or from table statistics) at most
+    once per ttl seconds, and the CRUD writes of this process keep it current
+    in between. Writes made by other workers show up once the count expires.
+    """
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # completed filter -> [expires_at, count]
+        self._entries: Dict[Optional[bool], list] = {}
+
+    def get(self, completed: Optional[bool] = None) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(completed)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[1]
+
+    def set(self, count: int, completed: Optional[bool] = None):
+        with self._lock:
+            self._entries[completed] = [time.monotonic() + self.ttl, count]
+
+    def adjust(self, delta: int, completed: Optional[bool] = None):
+        """
+        Apply an insert (delta > 0) or delete (delta < 0) to the cached counts.
+
+        Args:
+            delta (int): Change in the number of items
+            completed (Optional[bool]): Status of the affected items, or None
+                if unknown, in which case the per-status counts are dropped
+        """
+        with self._lock:
+            total = self._entries.get(None)
+            if total is not None:
+                total[1] = max(total[1] + delta, 0)
+            if completed is None:
+                self._entries.pop(True, None)
+                self._entries.pop(False, None)
+                return
+            entry = self._entries.get(completed)
+            if entry is not None:
+                entry[1] = max(entry[1] + delta, 0)
+
+    def status_changed(self):
+        """Drop the per-status counts after updates that may have changed completed."""
+        with self._lock:
+            self._entries.pop(True, None)
+            self._entries.pop(False, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Counts used by app.crud
+item_counts = ItemCounts()
@@ -1,4 +1,37 @@
-from app.crud.create import create_item
-from app.crud.read import get_item, get_items
-from app.crud.update import update_item
-from app.crud.delete import delete_item
\ No newline at end of file
+import app.singleflight as singleflight
+import app.storage as storage
+
+# Operations that change items; reads starting after one must not join reads started before it
+WRITE_OPERATIONS = ("create_item", "update_item", "delete_item", "create_items", "update_items", "delete_items")
+
+def _coalesced_read(name: str, fn):
+    def call(db, *args, **kwargs):
+        key = singleflight.read_key(db, name, args, kwargs)
+        if key is None:
+            return fn(db, *args, **kwargs)
+        return singleflight.item_reads.do(key, lambda: fn(db, *args, **kwargs))
+    return call
+
+def _write(fn):
+    def call(db, *args, **kwargs):
+        try:
+            return fn(db, *args, **kwargs)
+        finally:
+            singleflight.item_reads.forget()
+    return call
+
+def __getattr__(name):
+    # app.crud.get_item etc. are the operations of the configured storage
+    # backend (app.storage.item_storage); the SQL they run for MySQL and
+    # SQLite lives in the create, read, update, delete and bulk submodules.
+    # Concurrent identical reads from several threads share one query.
+    if name in storage.OPERATIONS:
+        fn = getattr(storage.item_storage, name)
+        if not storage.item_storage.blocking:
+            return fn
+        if name in singleflight.COALESCED_OPERATIONS:
+            return _coalesced_read(name, fn)
+        if name in WRITE_OPERATIONS:
+            return _write(fn)
+        return fn
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
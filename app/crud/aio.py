@@ -0,0 +1,117 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Callable, List, Optional, Union
+import time
+from app.models.item import Item
+from app.schemas.item import BulkResult, ItemCreate
+from app.schemas.item import Item as ItemSchema
+import app.metrics as metrics
+import app.singleflight as singleflight
+import app.storage as storage
+
+# Either session type can be passed to the async CRUD functions below
+AnySession = Union[Session, AsyncSession]
+
+async def run(db: AnySession, fn: Callable, **kwargs):
+    """
+    Run a sync CRUD function without blocking the event loop.
+    
+    With an AsyncSession the function runs against the async driver through
+    AsyncSession.run_sync, so no thread is involved. With a regular Session
+    it runs in the threadpool, which is what FastAPI does for sync routes.
+    Backends that never wait on I/O (the in-memory store) are called inline.
+    
+    Args:
+        db (AnySession): Database session
+        fn (Callable): CRUD function taking the session as first argument
+        **kwargs: Arguments passed on to fn
+        
+    Returns:
+        Whatever fn returns
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, **kwargs)
+    if not storage.item_storage.blocking:
+        return fn(db, **kwargs)
+    
+    queued_at = time.perf_counter()
+    
+    def call():
+        # Time spent waiting for a free worker shows up as threadpool time
+        metrics.record_threadpool_wait(time.perf_counter() - queued_at)
+        return fn(db, **kwargs)
+    
+    return await run_in_threadpool(call)
+
+async def read(db: AnySession, operation: str, **kwargs):
+    """
+    Run a storage read, sharing the query of an identical read already in flight.
+    
+    Coalescing happens here, before a thread is taken, so requests waiting
+    on another request's query do not hold threadpool workers.
+    
+    Args:
+        db (AnySession): Database session
+        operation (str): Name of the storage operation, e.g. "get_item"
+        **kwargs: Arguments passed on to the operation
+        
+    Returns:
+        Whatever the operation returns
+    """
+    fn = getattr(storage.item_storage, operation)
+    key = singleflight.read_key(db, operation, kwargs=kwargs) if storage.item_storage.blocking else None
+    if key is None:
+        return await run(db, fn, **kwargs)
+    return await singleflight.item_reads.do_async(key, lambda: run(db, fn, **kwargs))
+
+async def write(db: AnySession, operation: str, **kwargs):
+    """Run a storage write; reads starting after it will not join reads started before it"""
+    try:
+        return await run(db, getattr(storage.item_storage, operation), **kwargs)
+    finally:
+        singleflight.item_reads.forget()
+
+async def create_item(db: AnySession, item: ItemCreate) -> Item:
+    """Async version of app.crud.create_item"""
+    return await write(db, "create_item", item=item)
+
+async def get_item(db: AnySession, item_id: int, for_update: bool = False) -> Optional[Item]:
+    """Async version of app.crud.get_item"""
+    return await read(db, "get_item", item_id=item_id, for_update=for_update)
+
+async def get_items(db: AnySession, **filters) -> List[Item]:
+    """Async version of app.crud.get_items (takes the same keyword arguments)"""
+    return await read(db, "get_items", **filters)
+
+async def get_item_dicts(db: AnySession, **filters) -> List[dict]:
+    """Async version of app.crud.get_item_dicts (takes the same keyword arguments)"""
+    return await read(db, "get_item_dicts", **filters)
+
+async def count_items(db: AnySession, **filters) -> int:
+    """Async version of app.crud.count_items"""
+    return await run(db, storage.item_storage.count_items, **filters)
+
+async def explain_items(db: AnySession, **filters) -> List[dict]:
+    """Async version of app.crud.explain_items"""
+    return await run(db, storage.item_storage.explain_items, **filters)
+
+async def update_item(db: AnySession, item_id: int, item: ItemCreate) -> Optional[Item]:
+    """Async version of app.crud.update_item"""
+    return await write(db, "update_item", item_id=item_id, item=item)
+
+async def delete_item(db: AnySession, item_id: int) -> bool:
+    """Async version of app.crud.delete_item"""
+    return await write(db, "delete_item", item_id=item_id)
+
+async def create_items(db: AnySession, items: List[ItemCreate]) -> List[Item]:
+    """Async version of app.crud.create_items"""
+    return await write(db, "create_items", items=items)
+
+async def update_items(db: AnySession, items: List[ItemSchema]) -> List[BulkResult]:
+    """Async version of app.crud.update_items"""
+    return await write(db, "update_items", items=items)
+
+async def delete_items(db: AnySession, item_ids: List[int]) -> List[BulkResult]:
+    """Async version of app.crud.delete_items"""
+    return await write(db, "delete_items", item_ids=item_ids)
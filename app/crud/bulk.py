@@ -0,0 +1,231 @@
+import logging
+import threading
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.models.item import Item
+from app.ids import id_generator
+from app.shards import get_shards
+import app.cache as cache
+import app.counts as counts
+from app.schemas.item import BulkResult, ItemCreate
+from app.schemas.item import Item as ItemSchema
+
+# Rows per statement; keeps each statement well under max_allowed_packet
+BULK_CHUNK_SIZE = 1000
+
+logger = logging.getLogger("app.crud.bulk")
+
+# engine -> gap between the IDs of one multi-row INSERT, or None if they may not be evenly spaced
+_id_steps: Dict[object, Optional[int]] = {}
+_id_steps_lock = threading.Lock()
+
+def _chunks(rows: Sequence, size: int = BULK_CHUNK_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def _by_shard(db: Session, ids: List[int]) -> List[Tuple[Optional[dict], List[int]]]:
+    """Split ids into (bind_arguments, ids) pairs, one per shard that owns any of them."""
+    shards = get_shards(db)
+    if shards is None:
+        return [(None, ids)]
+    return [({"shard": shard}, group) for shard, group in shards.group(ids).items()]
+
+def _existing_ids(db: Session, ids: List[int]) -> set:
+    """Lock and return the subset of ids that exist."""
+    # SQLite has no row locks; its writers take turns on the database lock
+    lock = "" if db.bind.dialect.name == "sqlite" else " FOR UPDATE"
+    query = text(f"SELECT id FROM items WHERE id IN :ids{lock}").bindparams(
+        bindparam("ids", expanding=True)
+    )
+    found = set()
+    for bind, shard_ids in _by_shard(db, ids):
+        for chunk in _chunks(shard_ids):
+            found.update(row[0] for row in db.execute(query, {"ids": list(chunk)}, bind_arguments=bind))
+    return found
+
+def _insert_values(chunk: Sequence[ItemCreate], ids: Optional[Sequence[int]] = None) -> Tuple[str, dict]:
+    """Build a multi-row INSERT for chunk, with explicit IDs when ids is given."""
+    values = []
+    params = {}
+    for i, item in enumerate(chunk):
+        if ids is None:
+            values.append(f"(:title_{i}, :description_{i}, :completed_{i})")
+        else:
+            values.append(f"(:id_{i}, :title_{i}, :description_{i}, :completed_{i})")
+            params[f"id_{i}"] = ids[i]
+        params[f"title_{i}"] = item.title
+        params[f"description_{i}"] = item.description
+        params[f"completed_{i}"] = item.completed
+    columns = "title, description, completed" if ids is None else "id, title, description, completed"
+    return f"INSERT INTO items ({columns}) VALUES " + ", ".join(values), params
+
+def _id_step(db: Session) -> Optional[int]:
+    """
+    How far apart AUTO_INCREMENT puts the rows of one multi-row INSERT, or None if unknown.
+    
+    MySQL spaces them auto_increment_increment apart, but only when
+    innodb_autoinc_lock_mode is 0 or 1. In mode 2 (the MySQL 8 default)
+    concurrent inserts can interleave their IDs. SQLite always numbers
+    them consecutively. Checked once per engine.
+    """
+    engine = db.get_bind()
+    if engine.dialect.name != "mysql":
+        return 1
+    with _id_steps_lock:
+        if engine in _id_steps:
+            return _id_steps[engine]
+    increment, lock_mode = db.execute(
+        text("SELECT @@auto_increment_increment, @@innodb_autoinc_lock_mode")
+    ).fetchone()
+    step = int(increment) if int(lock_mode) in (0, 1) else None
+    if step is None:
+        logger.warning(
+            "innodb_autoinc_lock_mode is %s, so bulk creates insert one row per statement; "
+            "set it to 1 for multi-row inserts", lock_mode,
+        )
+    with _id_steps_lock:
+        _id_steps[engine] = step
+    return step
+
+def _to_item(item_id: int, item: ItemCreate) -> Item:
+    db_item = Item()
+    db_item.id = item_id
+    db_item.title = item.title
+    db_item.description = item.description
+    db_item.completed = item.completed
+    return db_item
+
+def create_items(db: Session, items: List[ItemCreate]) -> List[Item]:
+    """
+    Create many items with multi-row INSERT statements in one transaction.
+    
+    MySQL reports the ID of the first row of a multi-row INSERT and, with
+    innodb_autoinc_lock_mode 0 or 1, spaces the rest of the statement's IDs
+    auto_increment_increment apart, so IDs are assigned without re-reading
+    the rows. In lock mode 2 that spacing is not guaranteed and each row gets
+    its own INSERT (still in one transaction). When the table is sharded
+    the IDs come from the Snowflake generator and each shard gets its own
+    INSERT statements.
+    
+    Args:
+        db (Session): Database session
+        items (List[ItemCreate]): Items to create
+        
+    Returns:
+        List[Item]: The created items, in request order
+    """
+    created = []
+    if get_shards(db) is not None:
+        ids = id_generator.next_ids(len(items))
+        by_id = dict(zip(ids, items))
+        for bind, shard_ids in _by_shard(db, ids):
+            for chunk_ids in _chunks(shard_ids):
+                sql, params = _insert_values([by_id[item_id] for item_id in chunk_ids], chunk_ids)
+                db.execute(text(sql), params, bind_arguments=bind)
+        created = [_to_item(item_id, item) for item_id, item in zip(ids, items)]
+    else:
+        step = _id_step(db)
+        for chunk in _chunks(items, BULK_CHUNK_SIZE if step is not None else 1):
+            sql, params = _insert_values(chunk)
+            result = db.execute(text(sql), params)
+            
+            first_id = result.lastrowid
+            # SQLite (used for local benchmarks) reports the last row's ID instead
+            if db.get_bind().dialect.name == "sqlite":
+                first_id -= len(chunk) - 1
+            created.extend(_to_item(first_id + offset * (step or 1), item) for offset, item in enumerate(chunk))
+    
+    db.commit()
+    
+    completed_count = sum(1 for item in items if item.completed)
+    counts.item_counts.adjust(completed_count, True)
+    counts.item_counts.adjust(len(items) - completed_count, False)
+    
+    return created
+
+def update_items(db: Session, items: List[ItemSchema]) -> List[BulkResult]:
+    """
+    Update many items with UPDATE ... CASE statements in one transaction.
+    
+    If the same ID appears more than once, the last entry wins.
+    
+    Args:
+        db (Session): Database session
+        items (List[ItemSchema]): Items to update, each carrying its ID
+        
+    Returns:
+        List[BulkResult]: One result per requested item, "updated" or "not_found"
+    """
+    latest: Dict[int, ItemSchema] = {item.id: item for item in items}
+    existing = _existing_ids(db, list(latest))
+    to_update = [item_id for item_id in latest if item_id in existing]
+    
+    for bind, shard_ids in _by_shard(db, to_update):
+        for chunk in _chunks([latest[item_id] for item_id in shard_ids]):
+            title_cases = []
+            description_cases = []
+            completed_cases = []
+            params = {}
+            for i, item in enumerate(chunk):
+                title_cases.append(f"WHEN :id_{i} THEN :title_{i}")
+                description_cases.append(f"WHEN :id_{i} THEN :description_{i}")
+                completed_cases.append(f"WHEN :id_{i} THEN :completed_{i}")
+                params[f"id_{i}"] = item.id
+                params[f"title_{i}"] = item.title
+                params[f"description_{i}"] = item.description
+                params[f"completed_{i}"] = item.completed
+            params["ids"] = [item.id for item in chunk]
+            
+            query = text(f"""
+            UPDATE items
+            SET title = CASE id {" ".join(title_cases)} END,
+                description = CASE id {" ".join(description_cases)} END,
+                completed = CASE id {" ".join(completed_cases)} END
+            WHERE id IN :ids
+            """).bindparams(bindparam("ids", expanding=True))
+            db.execute(query, params, bind_arguments=bind)
+    
+    db.commit()
+    
+    for item_id in existing:
+        cache.item_cache.delete(item_id)
+    counts.item_counts.status_changed()
+    
+    return [
+        BulkResult(id=item.id, status="updated" if item.id in existing else "not_found")
+        for item in items
+    ]
+
+def delete_items(db: Session, item_ids: List[int]) -> List[BulkResult]:
+    """
+    Delete many items with DELETE ... WHERE id IN (...) in one transaction.
+    
+    Args:
+        db (Session): Database session
+        item_ids (List[int]): IDs of the items to delete
+        
+    Returns:
+        List[BulkResult]: One result per requested ID, "deleted" or "not_found"
+    """
+    unique_ids = list(dict.fromkeys(item_ids))
+    existing = _existing_ids(db, unique_ids)
+    
+    query = text("DELETE FROM items WHERE id IN :ids").bindparams(
+        bindparam("ids", expanding=True)
+    )
+    to_delete = [item_id for item_id in unique_ids if item_id in existing]
+    for bind, shard_ids in _by_shard(db, to_delete):
+        for chunk in _chunks(shard_ids):
+            db.execute(query, {"ids": list(chunk)}, bind_arguments=bind)
+    
+    db.commit()
+    
+    for item_id in existing:
+        cache.item_cache.delete(item_id)
+    counts.item_counts.adjust(-len(existing))
+    
+    return [
+        BulkResult(id=item_id, status="deleted" if item_id in existing else "not_found")
+        for item_id in item_ids
+    ]
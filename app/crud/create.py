@@ -1,12 +1,20 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.models.item import Item
+from app.ids import id_generator
+from app.shards import get_shards
+import app.cache as cache
+import app.counts as counts
 from app.schemas.item import ItemCreate
 
 def create_item(db: Session, item: ItemCreate):
     """
     Create a new item in the database using MySQL syntax.
     
+    When the table is sharded, AUTO_INCREMENT values would repeat across
+    shards, so the ID comes from the Snowflake generator instead and picks
+    the shard the row is written to.
+    
     Args:
         db (Session): Database session
         item (ItemCreate): Item data to create
@@ -14,26 +22,41 @@ def create_item(db: Session, item: ItemCreate):
     Returns:
         Item: The created item
     """
-    # Using raw SQL
-    query = text("""
-    INSERT INTO items (title, description, completed) 
-    VALUES (:title, :description, :completed)
-    """)
+    values = {
+        "title": item.title,
+        "description": item.description,
+        "completed": item.completed
+    }
     
-    result = db.execute(
-        query, 
-        {
-            "title": item.title,
-            "description": item.description,
-            "completed": item.completed
-        }
-    )
+    shards = get_shards(db)
+    if shards is not None:
+        last_id = id_generator.next_id()
+        query = text("""
+        INSERT INTO items (id, title, description, completed) 
+        VALUES (:id, :title, :description, :completed)
+        """)
+        db.execute(query, {"id": last_id, **values}, bind_arguments={"shard": shards.shard_for(last_id)})
+    else:
+        # Using raw SQL
+        query = text("""
+        INSERT INTO items (title, description, completed) 
+        VALUES (:title, :description, :completed)
+        """)
+        
+        result = db.execute(query, values)
+        # The driver reports the insert ID with the INSERT's own response, so
+        # there is no need to ask for LAST_INSERT_ID() or re-read the row
+        last_id = result.lastrowid
     db.commit()
     
-    # Get the last inserted ID
-    last_id = db.execute(text("SELECT LAST_INSERT_ID()")).scalar()
+    created_item = Item()
+    created_item.id = last_id
+    created_item.title = item.title
+    created_item.description = item.description
+    created_item.completed = item.completed
     
-    # Get the created item
-    created_item = db.query(Item).filter(Item.id == last_id).first()
+    # Write through so the first read of a new item is already cached
+    cache.item_cache.set(last_id, cache.item_to_dict(created_item))
+    counts.item_counts.adjust(1, item.completed)
     
     return created_item
\ No newline at end of file
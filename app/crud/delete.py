@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from typing import Optional
+from app.shards import item_bind
+import app.cache as cache
+import app.counts as counts
 
 def delete_item(db: Session, item_id: int) -> bool:
     """
@@ -13,15 +15,14 @@ def delete_item(db: Session, item_id: int) -> bool:
     Returns:
         bool: True if the item was deleted, False if the item was not found
     """
-    # Check if the item exists
-    check_query = text("SELECT 1 FROM items WHERE id = :item_id")
-    result = db.execute(check_query, {"item_id": item_id})
-    if result.fetchone() is None:
-        return False
-    
-    # Delete the item
+    # The affected row count tells us whether the item existed
     query = text("DELETE FROM items WHERE id = :item_id")
-    db.execute(query, {"item_id": item_id})
+    result = db.execute(query, {"item_id": item_id}, bind_arguments=item_bind(db, item_id))
+    deleted = result.rowcount > 0
     db.commit()
     
-    return True
\ No newline at end of file
+    cache.item_cache.delete(item_id)
+    if deleted:
+        counts.item_counts.adjust(-1)
+    
+    return deleted
\ No newline at end of file
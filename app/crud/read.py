@@ -1,26 +1,54 @@
+from contextlib import ExitStack
+from itertools import islice
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from app.models.item import Item
+from app.replicas import REPLICA_READ
+from app.shards import get_shards, item_bind, merge_by_id
+import app.cache as cache
+import app.counts as counts
 
-def get_item(db: Session, item_id: int) -> Optional[Item]:
+def _dialect(db: Session) -> str:
+    """Name of the session's database dialect, "mysql" or "sqlite"."""
+    # db.bind rather than get_bind(), which would pin the session to the primary
+    return db.bind.dialect.name if db.bind is not None else "mysql"
+
+def get_item(db: Session, item_id: int, for_update: bool = False) -> Optional[Item]:
     """
-    Get a single item by ID using MySQL syntax.
+    Get a single item by ID using MySQL syntax, reading through the item cache.
+    
+    Plain reads may be served by a read replica; locking reads always use the primary.
+    Only rows read from the primary are cached, as a lagging replica could
+    put back a row an update or delete just replaced, and sessions pinned to
+    the primary (X-Read-Primary) skip the cache.
+    When the table is sharded the item is read from the shard that owns its ID.
+    SQLite has no row locks (its writers take turns on the database lock), so
+    for_update only bypasses the cache there.
     
     Args:
         db (Session): Database session
         item_id (int): ID of the item to retrieve
+        for_update (bool): Lock the row until the transaction ends (skips the cache)
         
     Returns:
         Optional[Item]: The found item or None if not found
     """
-    query = text("""
+    if not for_update and not getattr(db, "read_primary", False):
+        cached = cache.item_cache.get(item_id)
+        if cached is not None:
+            return Item(**cached)
+    
+    lock = " FOR UPDATE" if for_update and _dialect(db) != "sqlite" else ""
+    query = text(f"""
     SELECT id, title, description, completed 
     FROM items 
-    WHERE id = :item_id
+    WHERE id = :item_id{lock}
     """)
     
-    result = db.execute(query, {"item_id": item_id}).fetchone()
+    result = db.execute(
+        query, {"item_id": item_id}, bind_arguments=item_bind(db, item_id, replica=not for_update)
+    ).fetchone()
     
     if result is None:
         return None
@@ -30,29 +58,145 @@ def get_item(db: Session, item_id: int) -> Optional[Item]:
     item.id = result[0]
     item.title = result[1]
     item.description = result[2]
-    item.completed = result[3]
+    # MySQL and SQLite return the flag as 0/1; keep it a bool like create and update do
+    item.completed = bool(result[3])
+    
+    if not getattr(db, "last_read_replica", False):
+        cache.item_cache.set(item_id, cache.item_to_dict(item))
     
     return item
 
-def get_items(db: Session, skip: int = 0, limit: int = 100) -> List[Item]:
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so a prefix matches literally (used with ESCAPE '!')."""
+    return value.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+def _filter_clauses(
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    search: Optional[str] = None,
+    dialect: str = "mysql",
+) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    Build the WHERE conditions shared by the item list queries.
+    
+    Each filter is served by an index on the items table: (completed, id) for
+    completed, the title index for title_prefix and the FULLTEXT index on
+    (title, description) for search. SQLite has no FULLTEXT index, so there
+    search matches any of its words anywhere in the title or description.
+    
+    Returns:
+        Tuple[List[str], Dict[str, Any]]: SQL conditions and their parameters
+    """
+    clauses = []
+    params = {}
+    if completed is not None:
+        clauses.append("completed = :completed")
+        params["completed"] = completed
+    if title_prefix:
+        clauses.append("title LIKE :title_prefix ESCAPE '!'")
+        params["title_prefix"] = _escape_like(title_prefix) + "%"
+    if search and dialect == "sqlite":
+        words = []
+        for i, word in enumerate(search.split() or [search]):
+            words.append(f"title LIKE :search_{i} ESCAPE '!' OR description LIKE :search_{i} ESCAPE '!'")
+            params[f"search_{i}"] = "%" + _escape_like(word) + "%"
+        clauses.append(f"({' OR '.join(words)})")
+    elif search:
+        clauses.append("MATCH(title, description) AGAINST (:search IN NATURAL LANGUAGE MODE)")
+        params["search"] = search
+    return clauses, params
+
+def _items_query(
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    search: Optional[str] = None,
+    descending: bool = False,
+    dialect: str = "mysql",
+) -> Tuple[str, Dict[str, Any]]:
+    """Build the SQL and parameters for one page of items."""
+    clauses, params = _filter_clauses(completed, title_prefix, search, dialect)
+    
+    if after_id is not None:
+        # Seek past the cursor in the direction of the sort
+        clauses.append("id < :after_id" if descending else "id > :after_id")
+        params["after_id"] = after_id
+        page = "LIMIT :limit"
+    else:
+        page = "LIMIT :limit OFFSET :skip"
+        params["skip"] = skip
+    params["limit"] = limit
+    
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"""
+    SELECT id, title, description, completed
+    FROM items
+    {where}
+    ORDER BY id {"DESC" if descending else "ASC"}
+    {page}
+    """
+    return sql, params
+
+def _page_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    search: Optional[str] = None,
+    descending: bool = False,
+) -> list:
+    """Fetch the rows of one page, merged from every shard in ID order when the table is sharded."""
+    dialect = _dialect(db)
+    shards = get_shards(db)
+    if shards is None:
+        sql, params = _items_query(skip, limit, after_id, completed, title_prefix, search, descending, dialect)
+        return db.execute(text(sql), params, bind_arguments=REPLICA_READ).all()
+    
+    # Any one shard may hold the whole page, so each returns up to skip + limit
+    # rows and the merged stream is cut to the page afterwards
+    if after_id is not None:
+        skip = 0
+    sql, params = _items_query(0, skip + limit, after_id, completed, title_prefix, search, descending, dialect)
+    query = text(sql)
+    results = shards.fan_out(db, lambda connection: connection.execute(query, params).all())
+    return list(islice(merge_by_id(results, descending), skip, skip + limit))
+
+def get_items(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    search: Optional[str] = None,
+    descending: bool = False,
+) -> List[Item]:
     """
-    Get multiple items with pagination using MySQL syntax.
+    Get multiple items with filtering and pagination using MySQL syntax.
+    
+    When after_id is given the page is fetched by seeking on the primary key
+    (keyset pagination), so deep pages cost the same as the first one.
+    Otherwise LIMIT/OFFSET is used and MySQL scans past every skipped row.
+    A sharded table is queried on every shard in parallel and merged by ID.
     
     Args:
         db (Session): Database session
-        skip (int): Number of records to skip (for pagination)
+        skip (int): Number of records to skip (ignored when after_id is set)
         limit (int): Maximum number of records to return
+        after_id (Optional[int]): Only return items past this ID in sort order
+        completed (Optional[bool]): Only return items with this status
+        title_prefix (Optional[str]): Only return items whose title starts with this
+        search (Optional[str]): Full-text search over title and description
+        descending (bool): Sort by ID from newest to oldest
         
     Returns:
-        List[Item]: List of found items
+        List[Item]: List of found items ordered by ID
     """
-    query = text("""
-    SELECT id, title, description, completed 
-    FROM items 
-    LIMIT :limit OFFSET :skip
-    """)
-    
-    result = db.execute(query, {"skip": skip, "limit": limit})
+    result = _page_rows(db, skip, limit, after_id, completed, title_prefix, search, descending)
     
     items = []
     for row in result:
@@ -60,7 +204,162 @@ def get_items(db: Session, skip: int = 0, limit: int = 100) -> List[Item]:
         item.id = row[0]
         item.title = row[1]
         item.description = row[2]
-        item.completed = row[3]
+        item.completed = bool(row[3])
         items.append(item)
     
-    return items
\ No newline at end of file
+    return items
+
+def get_item_dicts(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    search: Optional[str] = None,
+    descending: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Get the same page as get_items, as plain dicts ready to be serialized.
+    
+    Skips building an Item model per row (and the schema validation the
+    route would run on it), which dominates the cost of large pages.
+    
+    Returns:
+        List[Dict[str, Any]]: Items with id, title, description and completed keys
+    """
+    result = _page_rows(db, skip, limit, after_id, completed, title_prefix, search, descending)
+    
+    # MySQL returns BOOLEAN columns as 0/1
+    return [
+        {"id": item_id, "title": title, "description": description, "completed": bool(is_completed)}
+        for item_id, title, description, is_completed in result
+    ]
+
+def count_items(
+    db: Session,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    search: Optional[str] = None,
+    approximate: bool = False,
+) -> int:
+    """
+    Count the items matching the list filters.
+    
+    The exact count runs SELECT COUNT(*), which reads a whole index and gets
+    slower as the table grows. The approximate count reuses a recent count
+    kept current by this process's writes (see app.counts); for the whole of
+    a large table on MySQL a cold cache is filled from the table statistics.
+    Counts with title_prefix or search are always exact.
+    
+    Args:
+        db (Session): Database session
+        completed (Optional[bool]): Only count items with this status
+        title_prefix (Optional[str]): Only count items whose title starts with this
+        search (Optional[str]): Full-text search over title and description
+        approximate (bool): Accept a cached or estimated count
+        
+    Returns:
+        int: Number of matching items
+    """
+    cacheable = not title_prefix and not search
+    if approximate and cacheable:
+        cached = counts.item_counts.get(completed)
+        if cached is not None:
+            return cached
+        if completed is None:
+            estimate = _estimate_item_count(db)
+            # Statistics are least accurate on small tables, where COUNT(*) is cheap anyway
+            if estimate is not None and estimate >= counts.COUNT_ESTIMATE_MIN_ROWS:
+                counts.item_counts.set(estimate)
+                return estimate
+    
+    clauses, params = _filter_clauses(completed, title_prefix, search, _dialect(db))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    query = text(f"SELECT COUNT(*) FROM items {where}")
+    shards = get_shards(db)
+    if shards is None:
+        count = db.execute(query, params, bind_arguments=REPLICA_READ).scalar_one()
+    else:
+        count = sum(shards.fan_out(db, lambda connection: connection.execute(query, params).scalar_one()))
+    
+    if cacheable:
+        counts.item_counts.set(count, completed)
+    return count
+
+def _estimate_item_count(db: Session) -> Optional[int]:
+    """Row count of the items table from InnoDB statistics (MySQL only, may be off by a lot)"""
+    if _dialect(db) != "mysql":
+        return None
+    query = text("""
+    SELECT TABLE_ROWS
+    FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'items'
+    """)
+    shards = get_shards(db)
+    if shards is None:
+        return db.execute(query, bind_arguments=REPLICA_READ).scalar()
+    return sum(shards.fan_out(db, lambda connection: connection.execute(query).scalar() or 0))
+
+def stream_items(db: Session, chunk_size: int = 1000) -> Iterator[tuple]:
+    """
+    Stream every item row in ID order using a server-side cursor.
+    
+    Rows are fetched chunk_size at a time, so memory use does not grow with
+    the size of the table. A sharded table is streamed from every shard at
+    once and merged by ID.
+    
+    Args:
+        db (Session): Database session, kept busy until the iterator is exhausted
+        chunk_size (int): Number of rows fetched from the server at a time
+        
+    Returns:
+        Iterator[tuple]: (id, title, description, completed) rows
+    """
+    query = text("""
+    SELECT id, title, description, completed
+    FROM items
+    ORDER BY id
+    """)
+    
+    options = {"stream_results": True, "yield_per": chunk_size}
+    shards = get_shards(db)
+    if shards is None:
+        result = db.execute(query, execution_options=options, bind_arguments=REPLICA_READ)
+        for row in result:
+            yield tuple(row)
+        return
+    
+    # One server-side cursor per shard, each already in ID order
+    with ExitStack() as stack:
+        results = [
+            stack.enter_context(engine.connect()).execute(query, execution_options=options)
+            for engine in shards.engines
+        ]
+        for row in merge_by_id(results):
+            yield tuple(row)
+
+def explain_items(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    search: Optional[str] = None,
+    descending: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Run EXPLAIN on the query get_items would issue with the same arguments.
+    
+    Used to check that every filter is served by an index rather than a
+    full table scan (type "ALL" in MySQL's plan, "SCAN items" in SQLite's).
+    
+    Returns:
+        List[Dict[str, Any]]: One dict per row of the query plan
+    """
+    dialect = _dialect(db)
+    sql, params = _items_query(skip, limit, after_id, completed, title_prefix, search, descending, dialect)
+    explain = "EXPLAIN QUERY PLAN" if dialect == "sqlite" else "EXPLAIN"
+    result = db.execute(text(f"{explain} {sql}"), params, bind_arguments=REPLICA_READ)
+    return [dict(row._mapping) for row in result]
\ No newline at end of file
@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from typing import Dict, Any, Optional
+from typing import Optional
 from app.models.item import Item
+from app.shards import item_bind
+import app.cache as cache
+import app.counts as counts
 from app.schemas.item import ItemCreate
 
 def update_item(db: Session, item_id: int, item: ItemCreate) -> Optional[Item]:
@@ -16,12 +19,6 @@ def update_item(db: Session, item_id: int, item: ItemCreate) -> Optional[Item]:
     Returns:
         Optional[Item]: The updated item or None if not found
     """
-    # Check if the item exists
-    check_query = text("SELECT 1 FROM items WHERE id = :item_id")
-    result = db.execute(check_query, {"item_id": item_id})
-    if result.fetchone() is None:
-        return None
-    
     # Update the item
     query = text("""
     UPDATE items 
@@ -29,34 +26,32 @@ def update_item(db: Session, item_id: int, item: ItemCreate) -> Optional[Item]:
     WHERE id = :item_id
     """)
     
-    db.execute(
+    result = db.execute(
         query, 
         {
             "item_id": item_id,
             "title": item.title,
             "description": item.description,
             "completed": item.completed
-        }
+        },
+        bind_arguments=item_bind(db, item_id),
     )
+    # The matched row count tells us whether the item existed
+    # (SQLAlchemy's MySQL dialects report matched, not changed, rows)
+    matched = result.rowcount
     db.commit()
     
-    # Get the updated item
-    updated_query = text("""
-    SELECT id, title, description, completed 
-    FROM items 
-    WHERE id = :item_id
-    """)
-    
-    result = db.execute(updated_query, {"item_id": item_id}).fetchone()
-    
-    if result is None:
+    if matched == 0:
         return None
-        
-    # Convert row to Item model
+    
+    # Build the updated item from the data in hand instead of re-reading it
     updated_item = Item()
-    updated_item.id = result[0]
-    updated_item.title = result[1]
-    updated_item.description = result[2]
-    updated_item.completed = result[3]
+    updated_item.id = item_id
+    updated_item.title = item.title
+    updated_item.description = item.description
+    updated_item.completed = item.completed
+    
+    cache.item_cache.set(item_id, cache.item_to_dict(updated_item))
+    counts.item_counts.status_changed()
     
     return updated_item
\ No newline at end of file
@@ -1,11 +1,19 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from starlette.concurrency import run_in_threadpool
 import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+import threading
+import time
+from app.config import env_flag
+from app.replicas import ReplicaSet, RoutingSession
+from app.shards import ShardRouter
+import app.metrics as metrics
 
 # Get MySQL connection details from environment variables
 DB_HOST = os.getenv("DB_HOST", "localhost")
@@ -14,22 +22,374 @@ DB_NAME = os.getenv("DB_NAME", "crud")
 DB_USER = os.getenv("DB_USER", "crud")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "12345678")
 
-# MySQL connection URL
-SQLALCHEMY_DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Connection pool settings (applied to the sync and async engines)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+# Recycle connections before MySQL's wait_timeout (8 hours by default) drops them
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 3600))
+DB_POOL_PRE_PING = env_flag("DB_POOL_PRE_PING")
+# e.g. READ COMMITTED; leave unset to use the server default
+DB_ISOLATION_LEVEL = os.getenv("DB_ISOLATION_LEVEL")
+
+def storage_backend(url: str) -> str:
+    """Storage backend for a DATABASE_URL: "mysql", "sqlite" or "memory" (memory://)"""
+    if url.startswith("memory:"):
+        return "memory"
+    if url.startswith("sqlite"):
+        return "sqlite"
+    return "mysql"
+
+def _async_url(url: str) -> str:
+    """Swap a sync driver URL to its async driver (pymysql -> aiomysql, pysqlite -> aiosqlite)"""
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url.replace("+pymysql", "+aiomysql")
+
+# MySQL connection URL; DATABASE_URL overrides it with any MySQL or SQLite URL,
+# or memory:// for the in-process store. ASYNC_DATABASE_URL defaults to the
+# same database through the async driver
+SQLALCHEMY_DATABASE_URL = os.getenv(
+    "DATABASE_URL", f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+ASYNC_SQLALCHEMY_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(SQLALCHEMY_DATABASE_URL)
+DB_BACKEND = storage_backend(SQLALCHEMY_DATABASE_URL)
+
+# Serve the item routes through the async engine instead of the threadpool
+# (the in-memory backend never waits on I/O and ignores it)
+DB_ASYNC = env_flag("DB_ASYNC") and DB_BACKEND != "memory"
+
+# SQLite connection settings, applied to every new connection. WAL lets reads
+# run alongside the single writer, and synchronous=NORMAL only fsyncs at
+# checkpoints: commits survive an app crash but the last few may be lost on
+# power failure (use FULL if that matters)
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+# How long a write waits for the database lock before failing with "database is locked"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+SQLITE_PRAGMAS = {
+    "journal_mode": SQLITE_JOURNAL_MODE,
+    "synchronous": SQLITE_SYNCHRONOUS,
+    "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+    # 64 MB page cache (negative sizes are in KiB) and 256 MB of memory-mapped reads
+    "cache_size": -65536,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+}
+
+# Read replicas, comma-separated; reads in app.crud.read are spread across them
+DB_REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+# Async driver URLs of the same replicas; derived from DB_REPLICA_URLS by default
+ASYNC_DB_REPLICA_URLS = [
+    url.strip() for url in os.getenv("ASYNC_DB_REPLICA_URLS", "").split(",") if url.strip()
+] or [_async_url(url) for url in DB_REPLICA_URLS]
+# round_robin or least_connections
+DB_REPLICA_POLICY = os.getenv("DB_REPLICA_POLICY", "round_robin")
+# Seconds a replica that failed is left out of rotation
+DB_REPLICA_RETRY = float(os.getenv("DB_REPLICA_RETRY", 10))
+
+# Extra databases to split the items table across, comma-separated; the
+# primary database above is shard 0 and these are shards 1, 2, ...
+DB_SHARD_URLS = [url.strip() for url in os.getenv("DB_SHARD_URLS", "").split(",") if url.strip()]
+ASYNC_DB_SHARD_URLS = [
+    url.strip() for url in os.getenv("ASYNC_DB_SHARD_URLS", "").split(",") if url.strip()
+] or [_async_url(url) for url in DB_SHARD_URLS]
+# hash (spread IDs evenly) or range (DB_SHARD_BOUNDS: first item ID of shards 1, 2, ...)
+DB_SHARD_STRATEGY = os.getenv("DB_SHARD_STRATEGY", "hash")
+DB_SHARD_BOUNDS = [int(bound) for bound in os.getenv("DB_SHARD_BOUNDS", "").split(",") if bound.strip()]
+# When sharding an existing table: its MAX(id) at that time; those rows stay on shard 0
+DB_SHARD_LEGACY_MAX_ID = int(os.getenv("DB_SHARD_LEGACY_MAX_ID", 0))
+
+# Clients send this header to read from the primary, e.g. right after a write
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+class _WaitTimingMixin:
+    """Pool mixin that records how long checkouts wait for a connection."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_timeouts = 0
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.wait_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.wait_count += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+            metrics.record_pool_wait(waited)
+
+class TimedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+def _engine_options(poolclass, url: str = "") -> dict:
+    if url.startswith("sqlite") and make_url(url).database in (None, "", ":memory:"):
+        # An in-memory SQLite database lives and dies with its connection, so
+        # every session has to share one
+        return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+    options = {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if DB_ISOLATION_LEVEL:
+        options["isolation_level"] = DB_ISOLATION_LEVEL
+    return options
+
+def instrument_engine(engine):
+    """
+    Time every SQL statement run through an engine and report it to app.metrics.
+    
+    Args:
+        engine: Sync engine, or the sync_engine of an async engine
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_start = time.perf_counter()
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_start", None)
+        if start is not None:
+            metrics.record_query(statement, parameters, time.perf_counter() - start)
+
+def tune_sqlite(engine):
+    """
+    Apply SQLITE_PRAGMAS to every new connection of a SQLite engine.
+    
+    Args:
+        engine: Sync engine, or the sync_engine of an async engine; other
+            databases are left alone
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
 
-# Create MySQL engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+def _new_engine(url: str):
+    """Create an instrumented sync engine"""
+    engine = create_engine(url, **_engine_options(TimedQueuePool, url))
+    instrument_engine(engine)
+    tune_sqlite(engine)
+    return engine
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _new_async_engine(url: str):
+    """Create an instrumented async engine"""
+    engine = create_async_engine(url, **_engine_options(TimedAsyncAdaptedQueuePool, url))
+    instrument_engine(engine.sync_engine)
+    tune_sqlite(engine.sync_engine)
+    return engine
+
+class MemorySession:
+    """
+    Session handed to the CRUD functions by the in-memory backend.
+    
+    The items live in app.storage.MemoryStorage, which commits every change
+    as it is made, so there is nothing to commit, roll back or close here.
+    """
+    
+    def __init__(self, read_primary: bool = False):
+        self.read_primary = read_primary
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        pass
+    
+    def close(self):
+        pass
+
+# Engines are created on first use rather than at import, so importing the
+# app does not load the MySQL drivers or depend on the database being up
+_engine = None
+_session_factory = None
+_replicas = None
+_shards = None
+_async_engine = None
+_async_session_factory = None
+_async_replicas = None
+_async_shards = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """Get the database engine, creating it on first use (None for the in-memory backend)"""
+    global _engine, _session_factory, _replicas, _shards
+    if _engine is None and DB_BACKEND != "memory":
+        with _engine_lock:
+            if _engine is None:
+                engine = _new_engine(SQLALCHEMY_DATABASE_URL)
+                if DB_REPLICA_URLS:
+                    replica_engines = [_new_engine(url) for url in DB_REPLICA_URLS]
+                    _replicas = ReplicaSet(replica_engines, DB_REPLICA_POLICY, DB_REPLICA_RETRY)
+                if DB_SHARD_URLS:
+                    shard_engines = [_new_engine(url) for url in DB_SHARD_URLS]
+                    # Enough fan-out threads to use every pooled connection of every shard
+                    _shards = ShardRouter(
+                        [engine] + shard_engines, DB_SHARD_STRATEGY, DB_SHARD_BOUNDS,
+                        max_workers=(DB_POOL_SIZE + DB_MAX_OVERFLOW) * (len(shard_engines) + 1),
+                        legacy_max_id=DB_SHARD_LEGACY_MAX_ID,
+                    )
+                _session_factory = sessionmaker(
+                    autocommit=False, autoflush=False, bind=engine, class_=RoutingSession,
+                    replicas=_replicas, shards=_shards,
+                )
+                _engine = engine
+    return _engine
+
+def get_sessionmaker():
+    """Get the SessionLocal factory bound to the database engine"""
+    if DB_BACKEND == "memory":
+        return MemorySession
+    get_engine()
+    return _session_factory
+
+def get_async_engine():
+    """Get the async engine, or None unless DB_ASYNC is set (keeps aiomysql optional)"""
+    global _async_engine, _async_session_factory, _async_replicas, _async_shards
+    if DB_ASYNC and _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                async_engine = _new_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+                if ASYNC_DB_REPLICA_URLS:
+                    replica_engines = [_new_async_engine(url).sync_engine for url in ASYNC_DB_REPLICA_URLS]
+                    _async_replicas = ReplicaSet(replica_engines, DB_REPLICA_POLICY, DB_REPLICA_RETRY)
+                if ASYNC_DB_SHARD_URLS:
+                    shard_engines = [_new_async_engine(url).sync_engine for url in ASYNC_DB_SHARD_URLS]
+                    _async_shards = ShardRouter(
+                        [async_engine.sync_engine] + shard_engines, DB_SHARD_STRATEGY, DB_SHARD_BOUNDS,
+                        legacy_max_id=DB_SHARD_LEGACY_MAX_ID,
+                    )
+                _async_session_factory = async_sessionmaker(
+                    async_engine, autoflush=False, expire_on_commit=False,
+                    sync_session_class=RoutingSession, replicas=_async_replicas, shards=_async_shards,
+                )
+                _async_engine = async_engine
+    return _async_engine
+
+def get_async_sessionmaker():
+    """Get the AsyncSessionLocal factory, or None unless DB_ASYNC is set"""
+    get_async_engine()
+    return _async_session_factory
+
+def get_replicas():
+    """Get the read replicas used by the route sessions, or None if none are configured"""
+    if DB_ASYNC:
+        get_async_engine()
+        return _async_replicas
+    get_engine()
+    return _replicas
+
+def get_engines() -> list:
+    """Get the sync engines of every shard, primary first (only the primary when not sharded, none in memory)"""
+    if get_engine() is None:
+        return []
+    return list(_shards.engines) if _shards is not None else [_engine]
+
+async def dispose_engines():
+    """
+    Close the pooled connections of every engine that was created, when a worker shuts down.
+    
+    Async drivers such as aiosqlite run each connection on its own thread,
+    which would otherwise keep the process alive after the event loop ends.
+    """
+    for engine in get_engines() + [replica.engine for replica in (_replicas.replicas if _replicas else [])]:
+        await run_in_threadpool(engine.dispose)
+    if _async_engine is None:
+        return
+    # Replicas and shards keep the sync_engine of their AsyncEngine; wrap it again to close it
+    async_engines = [_async_engine]
+    async_engines += [AsyncEngine(replica.engine) for replica in (_async_replicas.replicas if _async_replicas else [])]
+    async_engines += [AsyncEngine(engine) for engine in (_async_shards.engines[1:] if _async_shards else [])]
+    for engine in async_engines:
+        await engine.dispose()
+
+def __getattr__(name):
+    # Keep `from app.database import engine, SessionLocal` working; the
+    # objects are created when first imported this way
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_sessionmaker()
+    if name == "async_engine":
+        return get_async_engine()
+    if name == "AsyncSessionLocal":
+        return get_async_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Create Base class
 Base = declarative_base()
 
+def _read_primary(request: Request) -> bool:
+    return request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true", "yes")
+
 # Dependency
-def get_db():
-    db = SessionLocal()
+def get_db(request: Request):
+    db = get_sessionmaker()(read_primary=_read_primary(request))
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db(request: Request):
+    async with get_async_sessionmaker()(read_primary=_read_primary(request)) as db:
+        yield db
+
+def pool_status(engine) -> dict:
+    """
+    Report live connection pool statistics for an engine.
+    
+    Args:
+        engine: Sync engine, or the sync_engine of an async engine
+        
+    Returns:
+        dict: Pool size, connection counts and checkout wait times
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": pool.status()}
+    
+    status = {
+        "size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool counts overflow from -pool_size; only report real overflow
+        "overflow": max(pool.overflow(), 0),
+        "timeout": pool.timeout(),
+    }
+    if isinstance(pool, _WaitTimingMixin):
+        with pool._stats_lock:
+            status.update({
+                "waits": pool.wait_count,
+                "wait_avg_ms": pool.wait_total / pool.wait_count * 1000 if pool.wait_count else 0.0,
+                "wait_max_ms": pool.wait_max * 1000,
+                "wait_timeouts": pool.wait_timeouts,
+            })
+    return status
+
+# Session dependency used by the routes, selected by DB_ASYNC
+get_session = get_async_db if DB_ASYNC else get_db
\ No newline at end of file
@@ -0,0 +1,65 @@
+import hashlib
+import json
+from typing import Iterable, Optional
+
+def _fields(item) -> list:
+    # completed may be a bool or the database's 0/1; both must give the same ETag
+    if isinstance(item, dict):
+        return [item["id"], item["title"], item["description"], bool(item["completed"])]
+    return [item.id, item.title, item.description, bool(item.completed)]
+
+def item_etag(item) -> str:
+    """
+    Compute a strong ETag from the item's schema fields.
+
+    Args:
+        item: Item model or schema
+
+    Returns:
+        str: Quoted ETag value
+    """
+    digest = hashlib.sha1(json.dumps(_fields(item)).encode()).hexdigest()
+    return f'"{digest}"'
+
+def page_etag(items: Iterable) -> str:
+    """
+    Compute an ETag for a list page from the fields of every item on it.
+
+    Args:
+        items (Iterable): Items (models, schemas or dicts) on the page, in response order
+
+    Returns:
+        str: Quoted ETag value
+    """
+    digest = hashlib.sha1()
+    for item in items:
+        digest.update(json.dumps(_fields(item)).encode())
+        digest.update(b"\n")
+    return f'"{digest.hexdigest()}"'
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match / If-Match header value against an ETag.
+
+    Weak validators (W/"...") are compared by their opaque value, and "*"
+    matches any current representation.
+
+    Args:
+        header (Optional[str]): Raw header value, possibly a comma-separated list
+        etag (str): Current quoted ETag
+
+    Returns:
+        bool: True if any listed tag matches
+    """
+    if header is None:
+        return False
+
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
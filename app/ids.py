@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+from typing import List
+import app.config  # noqa: F401  (loads .env)
+
+# Snowflake IDs: milliseconds since ID_EPOCH_MS, worker ID and a per-millisecond sequence
+ID_EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+TIMESTAMP_BITS = 41
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+# Must differ between every process that allocates IDs at the same time;
+# app_launcher.py serve gives each of its workers ID_WORKER_ID + its slot
+ID_WORKER_ID = int(os.getenv("ID_WORKER_ID", 0))
+
+class SnowflakeGenerator:
+    """
+    Thread-safe generator of 63-bit, roughly time-ordered unique IDs.
+
+    An ID packs the milliseconds since the epoch (41 bits, about 69 years),
+    the worker ID (10 bits) and a sequence number (12 bits, 4096 IDs per
+    millisecond per worker). IDs from different workers never collide, so
+    any database shard can store them without coordination.
+
+    Args:
+        worker_id (int): 0-1023, unique among processes generating IDs
+        epoch_ms (int): Start of the timestamp range, in Unix milliseconds
+    """
+
+    def __init__(self, worker_id: int = ID_WORKER_ID, epoch_ms: int = ID_EPOCH_MS):
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"ID worker ID must be between 0 and {MAX_WORKER_ID}, got {worker_id}")
+        self.worker_id = worker_id
+        self.epoch_ms = epoch_ms
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def _now_ms(self) -> int:
+        return time.time_ns() // 1_000_000 - self.epoch_ms
+
+    def next_id(self) -> int:
+        return self.next_ids(1)[0]
+
+    def next_ids(self, count: int) -> List[int]:
+        """Allocate count IDs in increasing order"""
+        ids = []
+        with self._lock:
+            while len(ids) < count:
+                now = self._now_ms()
+                if now < self._last_ms:
+                    # The clock went backwards; wait rather than risk reusing IDs
+                    time.sleep((self._last_ms - now) / 1000)
+                    continue
+                if now == self._last_ms:
+                    if self._sequence == MAX_SEQUENCE:
+                        # This millisecond is used up; spin until the next one
+                        continue
+                    self._sequence += 1
+                else:
+                    self._last_ms = now
+                    self._sequence = 0
+                ids.append(
+                    (now << (WORKER_BITS + SEQUENCE_BITS)) | (self.worker_id << SEQUENCE_BITS) | self._sequence
+                )
+        return ids
+
+def parse_id(item_id: int, epoch_ms: int = ID_EPOCH_MS) -> dict:
+    """
+    Split a Snowflake ID into its parts, e.g. to see when and where it was made.
+
+    Returns:
+        dict: timestamp_ms (Unix milliseconds), worker_id and sequence
+    """
+    return {
+        "timestamp_ms": (item_id >> (WORKER_BITS + SEQUENCE_BITS)) + epoch_ms,
+        "worker_id": (item_id >> SEQUENCE_BITS) & MAX_WORKER_ID,
+        "sequence": item_id & MAX_SEQUENCE,
+    }
+
+# Generator used for item IDs when the items table is sharded
+id_generator = SnowflakeGenerator()
@@ -0,0 +1,168 @@
+import csv
+import json
+from typing import AsyncIterator, List, Tuple
+from pydantic import ValidationError
+
+from app.crud.aio import AnySession
+from app.schemas.item import ImportResult, ImportRowError, ItemCreate
+import app.crud.aio as crud
+
+# Rows validated and inserted per multi-row INSERT
+IMPORT_CHUNK_SIZE = 1000
+
+# Rejected rows reported back in detail; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+class InvalidLine(str):
+    """A line that is not valid UTF-8, decoded with replacement characters."""
+
+def _decode(line: bytes) -> str:
+    line = line.rstrip(b"\r")
+    try:
+        return line.decode("utf-8")
+    except UnicodeDecodeError:
+        # Still yielded, so line numbers and CSV quoting stay in step
+        return InvalidLine(line.decode("utf-8", errors="replace"))
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of byte chunks into text lines without buffering the whole body.
+
+    Args:
+        chunks (AsyncIterator[bytes]): Raw body chunks
+
+    Returns:
+        AsyncIterator[str]: Lines with their line endings removed; lines that
+        are not valid UTF-8 come as InvalidLine
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield _decode(line)
+    if pending:
+        yield _decode(pending)
+
+async def iter_records(lines: AsyncIterator[str], import_format: str) -> AsyncIterator[Tuple[int, object]]:
+    """
+    Parse NDJSON or CSV lines into raw records.
+
+    CSV records may span several lines inside quoted fields, so lines are
+    grouped until their quotes balance before being handed to the csv module.
+
+    Args:
+        lines (AsyncIterator[str]): Lines of the uploaded file
+        import_format (str): "ndjson" or "csv"
+
+    Returns:
+        AsyncIterator[Tuple[int, object]]: (line number, record dict or parse error message)
+    """
+    header = None
+    record_lines: List[str] = []
+    record_start = 0
+    invalid_line = 0
+    line_no = 0
+
+    async for line in lines:
+        line_no += 1
+
+        if import_format == "ndjson":
+            if isinstance(line, InvalidLine):
+                yield line_no, "Invalid UTF-8"
+                continue
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, f"Invalid JSON: {e}"
+                continue
+            yield line_no, record if isinstance(record, dict) else "Expected a JSON object"
+            continue
+
+        if not record_lines:
+            record_start = line_no
+            invalid_line = 0
+        if isinstance(line, InvalidLine) and not invalid_line:
+            invalid_line = line_no
+        record_lines.append(line)
+        # An odd number of quotes means a quoted field continues on the next line
+        if sum(part.count('"') for part in record_lines) % 2:
+            continue
+
+        row = next(csv.reader(["\n".join(record_lines)]), [])
+        record_lines = []
+        if not row:
+            continue
+        if header is None:
+            header = [name.strip() for name in row]
+            continue
+        if invalid_line:
+            yield record_start, f"Invalid UTF-8 on line {invalid_line}"
+            continue
+
+        record = dict(zip(header, row))
+        # Exports write a missing description as an empty field
+        if record.get("description") == "":
+            record["description"] = None
+        yield record_start, record
+
+    if record_lines:
+        yield record_start, "Unterminated quoted field"
+
+async def import_items(
+    db: AnySession,
+    chunks: AsyncIterator[bytes],
+    import_format: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportResult:
+    """
+    Validate and insert items from an NDJSON or CSV stream, one chunk at a time.
+
+    Each chunk of valid rows is written with a single multi-row INSERT and
+    committed, so memory use is bounded by chunk_size rather than file size.
+
+    Args:
+        db (AnySession): Database session
+        chunks (AsyncIterator[bytes]): Raw file contents
+        import_format (str): "ndjson" or "csv"
+        chunk_size (int): Valid rows inserted per statement
+
+    Returns:
+        ImportResult: Accepted and rejected row counts with the first errors
+    """
+    accepted = 0
+    rejected = 0
+    errors: List[ImportRowError] = []
+    batch: List[ItemCreate] = []
+
+    async for line_no, record in iter_records(iter_lines(chunks), import_format):
+        try:
+            if isinstance(record, str):
+                raise ValueError(record)
+            batch.append(ItemCreate.model_validate(record))
+        except ValidationError as e:
+            rejected += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                message = "; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+                )
+                errors.append(ImportRowError(line=line_no, error=message))
+            continue
+        except ValueError as e:
+            rejected += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(ImportRowError(line=line_no, error=str(e)))
+            continue
+
+        if len(batch) >= chunk_size:
+            await crud.create_items(db=db, items=batch)
+            accepted += len(batch)
+            batch = []
+
+    if batch:
+        await crud.create_items(db=db, items=batch)
+        accepted += len(batch)
+
+    return ImportResult(accepted=accepted, rejected=rejected, errors=errors)
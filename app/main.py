@@ -1,29 +1,92 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
 import os
-from dotenv import load_dotenv
+import time
 
-from app.database import engine
-from app.models.item import Item
+from app.admission import MAX_CONCURRENT_REQUESTS, RATE_LIMIT_RPS, AdmissionMiddleware
+from app.batcher import BATCH_CREATES, create_batcher
+from app.compression import CompressionMiddleware
+from app.config import env_flag
+from app.database import dispose_engines
+from app.migrate import create_schema, logger as migrate_logger
 import app.routes.item as item_routes
+import app.routes.system as system_routes
+import app.metrics as metrics
 
-# Create tables in the database
-from app.database import Base
-Base.metadata.create_all(bind=engine)
+# Create missing tables when a worker starts; turn off once `python -m app.migrate` runs at deploy time
+DB_CREATE_SCHEMA = env_flag("DB_CREATE_SCHEMA", True)
 
-# Load environment variables
-load_dotenv()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DB_CREATE_SCHEMA:
+        try:
+            await run_in_threadpool(create_schema)
+        except SQLAlchemyError as e:
+            # Start anyway; /api/system/ready reports 503 until the database is reachable
+            migrate_logger.warning("Schema creation skipped, database unavailable: %s", e)
+    if BATCH_CREATES:
+        create_batcher.start()
+    yield
+    # Write the creates still queued before the worker exits
+    await create_batcher.stop()
+    await dispose_engines()
 
 # Initialize FastAPI app
-app = FastAPI(title="FastAPI CRUD App with MySQL")
+app = FastAPI(title="FastAPI CRUD App with MySQL", lifespan=lifespan)
+
+# Shed excess load before it reaches the routes; added first so it runs inside
+# the instrumentation below and shed requests still show up in the metrics
+if RATE_LIMIT_RPS > 0 or MAX_CONCURRENT_REQUESTS > 0:
+    app.add_middleware(AdmissionMiddleware)
+
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    """Time each request and its SQL, and report them as headers, logs and metrics"""
+    stats = metrics.RequestStats()
+    token = metrics.current_request.set(stats)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        duration = time.perf_counter() - start
+        response.headers["Server-Timing"] = metrics.server_timing(duration, stats)
+        return response
+    finally:
+        duration = time.perf_counter() - start
+        metrics.current_request.reset(token)
+        # Label by route template so /api/items/1 and /api/items/2 share a series
+        route = request.scope.get("route")
+        metrics.record_request(
+            request.method,
+            route.path if route is not None else "unmatched",
+            status,
+            request.url.path,
+            duration,
+            stats,
+        )
+
+# Compress responses for clients that accept gzip or brotli (outermost, so it sees the final body)
+if env_flag("COMPRESSION_ENABLED", True):
+    app.add_middleware(CompressionMiddleware)
 
 # Include routers
 app.include_router(item_routes.router)
+app.include_router(system_routes.router)
 
 # Root endpoint
 @app.get("/")
 async def read_root():
     return {"message": "Welcome to FastAPI CRUD App with MySQL"}
 
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    return PlainTextResponse(metrics.render_metrics(), media_type="text/plain; version=0.0.4")
+
 # Run with: uvicorn app.main:app --reload
 if __name__ == "__main__":
     import uvicorn
@@ -31,4 +94,7 @@ if __name__ == "__main__":
     host = os.getenv("API_HOST", "127.0.0.1")
     port = int(os.getenv("API_PORT", 8000))
     
-    uvicorn.run("app.main:app", host=host, port=port, reload=True)
\ No newline at end of file
+    # Development server; use `python app_launcher.py serve` for multi-worker production serving
+    reload = env_flag("API_RELOAD", True)
+    
+    uvicorn.run("app.main:app", host=host, port=port, reload=reload)
\ No newline at end of file
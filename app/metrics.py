@@ -0,0 +1,238 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.config import env_flag
+
+# Queries slower than this are logged with their SQL text and a params fingerprint
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 100))
+# Emit one structured JSON log line per request
+LOG_REQUESTS = env_flag("LOG_REQUESTS", True)
+
+# Histogram buckets in seconds, from 1 ms to 10 s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+logger = logging.getLogger("app.requests")
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+if not logger.handlers:
+    # Log lines are already JSON, so print them as-is
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    for _logger in (logger, slow_query_logger):
+        _logger.addHandler(_handler)
+        _logger.setLevel(logging.INFO)
+        _logger.propagate = False
+
+class RequestStats:
+    """Timings collected while serving one request."""
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.query_count = 0
+        self.pool_wait = 0.0
+        self.threadpool_wait = 0.0
+        self.slow_queries: List[dict] = []
+
+# Stats of the request being served; the object is shared with threadpool
+# workers and greenlets, which run in copies of the request's context
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+class Histogram:
+    """Prometheus-style cumulative histogram, keyed by label values."""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, label_values))
+            bucket_labels = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{bucket_labels}le="{bound:g}"}} {cumulative}')
+            cumulative += values[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{bucket_labels}le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {values[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+class Counter:
+    """Prometheus-style counter, keyed by label values."""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, label_values))
+            lines.append(f"{self.name}{{{labels}}} {value:g}")
+        return lines
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Wall time spent serving requests",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds", "Time spent executing SQL per request",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per request",
+    ("method", "route"), QUERY_COUNT_BUCKETS,
+)
+SLOW_QUERIES = Counter(
+    "db_slow_queries_total", f"SQL statements slower than SLOW_QUERY_MS ({SLOW_QUERY_MS:g} ms)",
+    ("route",),
+)
+
+# Collectors rendered by /metrics; other modules may append their own
+REGISTRY = [REQUEST_DURATION, REQUEST_DB_DURATION, REQUEST_QUERIES, SLOW_QUERIES]
+
+def params_fingerprint(parameters) -> str:
+    """
+    Hash query parameters so repeated slow queries can be grouped without logging values.
+
+    Args:
+        parameters: DBAPI parameters as passed to cursor.execute
+
+    Returns:
+        str: Short hex digest
+    """
+    return hashlib.sha1(repr(parameters).encode()).hexdigest()[:12]
+
+def record_query(statement: str, parameters, elapsed: float):
+    """
+    Add one executed SQL statement to the current request's stats.
+
+    Called from the engine's after_cursor_execute hook, possibly in a
+    threadpool worker; queries run outside a request are only logged if slow.
+
+    Args:
+        statement (str): SQL text sent to the driver
+        parameters: DBAPI parameters
+        elapsed (float): Execution time in seconds
+    """
+    stats = current_request.get()
+    if stats is not None:
+        stats.db_time += elapsed
+        stats.query_count += 1
+
+    if elapsed * 1000 < SLOW_QUERY_MS:
+        return
+    slow_query = {
+        "duration_ms": round(elapsed * 1000, 3),
+        "statement": " ".join(statement.split()),
+        "params_fingerprint": params_fingerprint(parameters),
+    }
+    if stats is not None:
+        stats.slow_queries.append(slow_query)
+    slow_query_logger.warning(json.dumps({"event": "slow_query", **slow_query}))
+
+def record_pool_wait(elapsed: float):
+    """Add time spent waiting for a pooled connection to the current request."""
+    stats = current_request.get()
+    if stats is not None:
+        stats.pool_wait += elapsed
+
+def record_threadpool_wait(elapsed: float):
+    """Add time a CRUD call spent queued for a threadpool worker to the current request."""
+    stats = current_request.get()
+    if stats is not None:
+        stats.threadpool_wait += elapsed
+
+def record_request(method: str, route: str, status: int, path: str, duration: float, stats: RequestStats):
+    """
+    Record a finished request in the route histograms and the request log.
+
+    Args:
+        method (str): HTTP method
+        route (str): Route path template, e.g. /api/items/{item_id}
+        status (int): Response status code
+        path (str): Actual request path
+        duration (float): Wall time in seconds
+        stats (RequestStats): DB timings collected during the request
+    """
+    REQUEST_DURATION.observe(duration, method, route, str(status))
+    REQUEST_DB_DURATION.observe(stats.db_time, method, route)
+    REQUEST_QUERIES.observe(stats.query_count, method, route)
+    if stats.slow_queries:
+        SLOW_QUERIES.inc(route, amount=len(stats.slow_queries))
+
+    if LOG_REQUESTS:
+        logger.info(json.dumps({
+            "event": "request",
+            "method": method,
+            "route": route,
+            "path": path,
+            "status": status,
+            "duration_ms": round(duration * 1000, 3),
+            "db_ms": round(stats.db_time * 1000, 3),
+            "queries": stats.query_count,
+            "pool_wait_ms": round(stats.pool_wait * 1000, 3),
+            "threadpool_wait_ms": round(stats.threadpool_wait * 1000, 3),
+            "slow_queries": len(stats.slow_queries),
+        }))
+
+def server_timing(duration: float, stats: RequestStats) -> str:
+    """
+    Format request timings as a Server-Timing header value.
+
+    Args:
+        duration (float): Wall time in seconds up to the response headers
+        stats (RequestStats): DB timings collected during the request
+
+    Returns:
+        str: Header value with app, db, pool and threadpool entries in milliseconds
+    """
+    return ", ".join([
+        f"app;dur={duration * 1000:.3f}",
+        f'db;dur={stats.db_time * 1000:.3f};desc="{stats.query_count} queries"',
+        f"pool;dur={stats.pool_wait * 1000:.3f}",
+        f"threadpool;dur={stats.threadpool_wait * 1000:.3f}",
+    ])
+
+def render_metrics() -> str:
+    """Render every registered collector in the Prometheus text format."""
+    lines = []
+    for collector in REGISTRY:
+        lines.extend(collector.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,33 @@
+import logging
+import sys
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.database import Base, get_engines
+import app.models.item  # noqa: F401  (registers the items table)
+
+logger = logging.getLogger("app.migrate")
+
+def create_schema():
+    """
+    Create the items table, with its indexes, on every shard where it does not exist yet.
+    
+    Tables that already exist are left as they are: indexes and column
+    changes added since they were created are not applied. The README's
+    MySQL Schema section has the statements to upgrade an existing table.
+    """
+    for engine in get_engines():
+        Base.metadata.create_all(bind=engine)
+
+def main() -> int:
+    """Create the schema once, e.g. before starting workers with DB_CREATE_SCHEMA=false"""
+    try:
+        create_schema()
+    except SQLAlchemyError as e:
+        print(f"Schema creation failed: {e}", file=sys.stderr)
+        return 1
+    print("Missing tables created; existing tables are not altered (see the README to upgrade them).")
+    return 0
+
+# Run with: python -m app.migrate
+if __name__ == "__main__":
+    sys.exit(main())
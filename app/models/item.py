@@ -1,10 +1,19 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import BigInteger, Column, Integer, String, Boolean, Index
 from app.database import Base
 
 class Item(Base):
     __tablename__ = "items"
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # BIGINT so sharded tables can hold 63-bit Snowflake IDs (app.ids); SQLite
+    # only auto-increments a column declared INTEGER
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True, autoincrement=True)
     title = Column(String(255), index=True, nullable=False)
     description = Column(String(1000), nullable=True)
-    completed = Column(Boolean, default=False, nullable=False)
\ No newline at end of file
+    completed = Column(Boolean, default=False, nullable=False)
+
+    __table_args__ = (
+        # Serves completed filters together with ORDER BY id and cursor seeks
+        Index("ix_items_completed_id", "completed", "id"),
+        # Serves full-text search over title and description
+        Index("ix_items_title_description_fulltext", "title", "description", mysql_prefix="FULLTEXT"),
+    )
\ No newline at end of file
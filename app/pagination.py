@@ -0,0 +1,41 @@
+import base64
+import binascii
+from typing import Optional
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Response header carrying the number of matching items, when requested
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode the id of the last row on a page into an opaque cursor token.
+
+    Args:
+        last_id (int): ID of the last item returned on the current page
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Optional[int]:
+    """
+    Decode a cursor token produced by encode_cursor.
+
+    Args:
+        cursor (str): Cursor token sent by the client
+
+    Returns:
+        Optional[int]: The item ID to seek after, or None if the token is invalid
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, _, value = base64.urlsafe_b64decode(padded.encode()).decode().partition(":")
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+    if prefix != "id" or not value.isdigit():
+        return None
+
+    return int(value)
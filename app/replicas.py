@@ -0,0 +1,148 @@
+import itertools
+import threading
+import time
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+# Pass as bind_arguments to Session.execute to allow a read to go to a replica
+REPLICA_READ = {"replica": True}
+
+class Replica:
+    """One read replica engine and its health state."""
+
+    def __init__(self, name: str, engine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.retry_at = 0.0
+        self.failures = 0
+        self.reads = 0
+
+    def in_use(self) -> int:
+        checkedout = getattr(self.engine.pool, "checkedout", None)
+        return checkedout() if checkedout else 0
+
+class ReplicaSet:
+    """
+    Pick a read replica per query, skipping replicas that recently failed.
+
+    A replica whose connection or query fails with a connection-level error
+    is taken out of rotation for retry_after seconds. After that it gets
+    traffic again, and goes straight back out if it is still failing.
+
+    Args:
+        engines (list): Sync engines (or async engines' sync_engine) of the replicas
+        policy (str): "round_robin" or "least_connections" (fewest checked-out connections)
+        retry_after (float): Seconds a failed replica is skipped
+    """
+
+    def __init__(self, engines: list, policy: str = "round_robin", retry_after: float = 10):
+        if policy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica policy: {policy}")
+        self.replicas = [Replica(f"replica{index}", engine) for index, engine in enumerate(engines)]
+        self.policy = policy
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._cycle = itertools.cycle(self.replicas)
+        for replica in self.replicas:
+            self._watch(replica)
+
+    def _watch(self, replica: Replica):
+        @event.listens_for(replica.engine, "handle_error")
+        def _handle_error(context):
+            # Only connection problems say something about the replica's health
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+                self.mark_down(replica)
+
+    def mark_down(self, replica: Replica):
+        with self._lock:
+            replica.healthy = False
+            replica.failures += 1
+            replica.retry_at = time.monotonic() + self.retry_after
+
+    def choose(self) -> Optional[Replica]:
+        """Pick a replica for the next read, or None if none is available"""
+        now = time.monotonic()
+        with self._lock:
+            available = [r for r in self.replicas if r.healthy or r.retry_at <= now]
+            if not available:
+                return None
+            if self.policy == "least_connections":
+                fewest = min(r.in_use() for r in available)
+                # Rotate between equally loaded replicas so idle ones all get traffic
+                available = [r for r in available if r.in_use() == fewest]
+            replica = next(r for r in self._cycle if r in available)
+            # A replica back from its retry window is trusted until it fails again
+            replica.healthy = True
+            replica.reads += 1
+            return replica
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "name": r.name,
+                    "url": r.engine.url.render_as_string(hide_password=True),
+                    "healthy": r.healthy,
+                    "retry_in": max(r.retry_at - now, 0.0) if not r.healthy else 0.0,
+                    "failures": r.failures,
+                    "reads": r.reads,
+                    "checked_out": r.in_use(),
+                }
+                for r in self.replicas
+            ]
+
+class RoutingSession(Session):
+    """
+    Session that sends reads marked with REPLICA_READ to a read replica.
+
+    Everything else goes to the primary, and once a session has used the
+    primary all its later reads stay there, so a request sees its own
+    writes. Set read_primary to keep every read on the primary (e.g. a
+    client that just wrote asks for read-your-writes). A read that fails on
+    a replica is retried once on the primary.
+
+    When the items table is sharded (see app.shards), statements whose
+    bind_arguments carry {"shard": n} go to that shard's engine.
+    """
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, read_primary: bool = False,
+                 shards=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.read_primary = read_primary
+        self.shards = shards
+        self.used_primary = False
+        # Whether the last statement ran on a replica (and may be behind the primary)
+        self.last_read_replica = False
+
+    def _replica_reads_allowed(self) -> bool:
+        return self.replicas is not None and not self.read_primary and not self.used_primary
+
+    def get_bind(self, mapper=None, *, clause=None, replica: bool = False, shard: Optional[int] = None, **kw):
+        self.last_read_replica = False
+        if shard is not None and self.shards is not None:
+            return self.shards.engines[shard]
+        if replica and self._replica_reads_allowed():
+            chosen = self.replicas.choose()
+            if chosen is not None:
+                self.last_read_replica = True
+                return chosen.engine
+        self.used_primary = True
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def execute(self, statement, params=None, *, bind_arguments=None, **kw):
+        if not (bind_arguments and bind_arguments.get("replica") and self._replica_reads_allowed()):
+            return super().execute(statement, params, bind_arguments=bind_arguments, **kw)
+        try:
+            return super().execute(statement, params, bind_arguments=bind_arguments, **kw)
+        except OperationalError:
+            if self.used_primary:
+                # No replica was available and the read already ran on the primary
+                raise
+            # Only replicas have been used so far, so nothing is lost by rolling back
+            self.rollback()
+            return super().execute(statement, params, **kw)
@@ -0,0 +1,36 @@
+import json
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    orjson = None
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize plain JSON types (dicts, lists, str, int, float, bool, None) to bytes.
+
+    Uses orjson when it is installed and falls back to the stdlib encoder
+    with compact separators otherwise.
+
+    Args:
+        content (Any): Value made of plain JSON types only
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for content that is already made of plain dicts and lists.
+
+    Returning it from a route skips FastAPI's response_model validation and
+    jsonable_encoder pass, so the content must already match the schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
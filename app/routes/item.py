@@ -1,50 +1,273 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Optional
+import csv
+import io
+import json
+import os
 
-from app.database import get_db
-from app.schemas.item import Item, ItemCreate
-import app.crud as crud
+from app.database import get_session, get_sessionmaker
+from app.schemas.item import Item, ItemCreate, ItemCount, BulkResult, ImportResult
+from app.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, encode_cursor, decode_cursor
+from app.etag import etag_matches, item_etag, page_etag
+from app.crud.aio import AnySession
+import app.crud.aio as crud
+import app.storage as storage
+from app.importer import import_items as import_item_stream
+from app.responses import FastJSONResponse
+from app.batcher import BatcherOverloaded, create_batcher
 
 router = APIRouter(
     prefix="/api/items",
     tags=["items"],
 )
 
+# Rows serialized per chunk written to an export stream
+EXPORT_BATCH_SIZE = 1000
+
+# Largest page a list request returns; larger limits are cut down to it
+# (follow X-Next-Cursor for the rest, or use /export for everything)
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 1000))
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _export_chunks(export_format: str) -> Iterator[str]:
+    """Serialize the items table in batches from a server-side cursor."""
+    # The export outlives the request handler, so it uses its own session
+    SessionLocal = get_sessionmaker()
+    db = SessionLocal()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == "csv" else None
+        if writer is not None:
+            writer.writerow(["id", "title", "description", "completed"])
+    
+        rows = 0
+        for item_id, title, description, completed in storage.item_storage.stream_items(db, chunk_size=EXPORT_BATCH_SIZE):
+            if writer is not None:
+                writer.writerow([item_id, title, description, "true" if completed else "false"])
+            else:
+                buffer.write(json.dumps({
+                    "id": item_id,
+                    "title": title,
+                    "description": description,
+                    "completed": bool(completed),
+                }))
+                buffer.write("\n")
+        
+            rows += 1
+            if rows % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
 # CREATE operation
 @router.post("/", response_model=Item, status_code=status.HTTP_201_CREATED)
-def create_item(item: ItemCreate, db: Session = Depends(get_db)):
+async def create_item(item: ItemCreate, response: Response, db: AnySession = Depends(get_session)):
     """Create a new item"""
-    return crud.create_item(db=db, item=item)
+    if create_batcher.running:
+        # Group commit: wait for this item's batch to be written
+        try:
+            db_item = await create_batcher.submit(item)
+        except BatcherOverloaded as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    else:
+        db_item = await crud.create_item(db=db, item=item)
+    response.headers["ETag"] = item_etag(db_item)
+    return db_item
+
+# BULK operations (declared before /{item_id} so "bulk" is not parsed as an ID)
+@router.post("/bulk", response_model=List[Item], status_code=status.HTTP_201_CREATED)
+async def create_items(items: List[ItemCreate], db: AnySession = Depends(get_session)):
+    """Create many items in one transaction"""
+    return await crud.create_items(db=db, items=items)
+
+@router.put("/bulk", response_model=List[BulkResult])
+async def update_items(items: List[Item], db: AnySession = Depends(get_session)):
+    """Update many items in one transaction"""
+    return await crud.update_items(db=db, items=items)
+
+@router.delete("/bulk", response_model=List[BulkResult])
+async def delete_items(item_ids: List[int] = Body(...), db: AnySession = Depends(get_session)):
+    """Delete many items in one transaction"""
+    return await crud.delete_items(db=db, item_ids=item_ids)
+
+@router.post("/import", response_model=ImportResult)
+async def import_items(
+    request: Request,
+    import_format: Optional[str] = Query(None, alias="format", pattern="^(ndjson|csv)$"),
+    db: AnySession = Depends(get_session),
+):
+    """Import items from an NDJSON or CSV upload, streamed in chunks"""
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("multipart/form-data"):
+        # python-multipart spools the upload to a temporary file, which is read back in blocks
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Missing 'file' upload")
+        filename = upload.filename or ""
+    
+        async def chunks():
+            while block := await upload.read(64 * 1024):
+                yield block
+    else:
+        # Any other body is read straight off the socket as it arrives
+        filename = ""
+        chunks = request.stream
+
+    if import_format is None:
+        is_csv = "csv" in content_type or filename.lower().endswith(".csv")
+        import_format = "csv" if is_csv else "ndjson"
+
+    return await import_item_stream(db, chunks(), import_format)
 
 # READ operations
+def item_filters(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, description="Page size, lowered to MAX_PAGE_SIZE if larger"),
+    cursor: Optional[str] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    q: Optional[str] = Query(None, description="Full-text search over title and description"),
+    sort: str = Query("asc", pattern="^(asc|desc)$", description="Sort by ID"),
+) -> dict:
+    """Query parameters shared by the item list endpoints"""
+    after_id = None
+    if cursor is not None:
+        after_id = decode_cursor(cursor)
+        if after_id is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    return {
+        "skip": skip,
+        "limit": min(limit, MAX_PAGE_SIZE),
+        "after_id": after_id,
+        "completed": completed,
+        "title_prefix": title_prefix,
+        "search": q,
+        "descending": sort == "desc",
+    }
+
+COUNT_MODE_PATTERN = "^(exact|approx)$"
+
 @router.get("/", response_model=List[Item])
-def read_items(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all items with pagination"""
-    return crud.get_items(db=db, skip=skip, limit=limit)
+async def read_items(
+    filters: dict = Depends(item_filters),
+    with_count: Optional[str] = Query(
+        None, pattern=COUNT_MODE_PATTERN, description="Also send the number of matching items in X-Total-Count"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AnySession = Depends(get_session),
+):
+    """Get items with filtering, sorting and offset or cursor pagination"""
+    # Rows come back as dicts matching the Item schema and are serialized directly
+    items = await crud.get_item_dicts(db=db, **filters)
+    
+    headers = {"ETag": page_etag(items)}
+    # A full page means there may be more rows after it
+    if items and len(items) == filters["limit"]:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1]["id"])
+    if with_count is not None:
+        total = await crud.count_items(
+            db=db,
+            completed=filters["completed"],
+            title_prefix=filters["title_prefix"],
+            search=filters["search"],
+            approximate=with_count == "approx",
+        )
+        headers[TOTAL_COUNT_HEADER] = str(total)
+    
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FastJSONResponse(items, headers=headers)
+
+@router.get("/explain")
+async def explain_items(filters: dict = Depends(item_filters), db: AnySession = Depends(get_session)):
+    """Show the MySQL query plan for a list request with the same parameters"""
+    return await crud.explain_items(db=db, **filters)
+
+@router.get("/count", response_model=ItemCount)
+async def count_items(
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    q: Optional[str] = Query(None, description="Full-text search over title and description"),
+    mode: str = Query("exact", pattern=COUNT_MODE_PATTERN, description="approx may return a cached or estimated count"),
+    db: AnySession = Depends(get_session),
+):
+    """Count the items matching the list filters"""
+    # Filtered counts other than by status are always exact
+    approximate = mode == "approx" and not title_prefix and not q
+    count = await crud.count_items(
+        db=db, completed=completed, title_prefix=title_prefix, search=q, approximate=approximate
+    )
+    return {"count": count, "approximate": approximate}
+
+@router.get("/export")
+async def export_items(export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$")):
+    """Stream every item as NDJSON or CSV"""
+    return StreamingResponse(
+        _export_chunks(export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="items.{export_format}"'},
+    )
 
 @router.get("/{item_id}", response_model=Item)
-def read_item(item_id: int, db: Session = Depends(get_db)):
+async def read_item(
+    item_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AnySession = Depends(get_session),
+):
     """Get a specific item by ID"""
-    db_item = crud.get_item(db=db, item_id=item_id)
+    db_item = await crud.get_item(db=db, item_id=item_id)
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
+
+    etag = item_etag(db_item)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return db_item
 
 # UPDATE operation
 @router.put("/{item_id}", response_model=Item)
-def update_item(item_id: int, item: ItemCreate, db: Session = Depends(get_db)):
-    """Update an existing item"""
-    db_item = crud.update_item(db=db, item_id=item_id, item=item)
+async def update_item(
+    item_id: int,
+    item: ItemCreate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AnySession = Depends(get_session),
+):
+    """Update an existing item, optionally only if it still matches If-Match"""
+    if if_match is not None:
+        # Lock the row so nobody can change it between the check and the update
+        current = await crud.get_item(db=db, item_id=item_id, for_update=True)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        if not etag_matches(if_match, item_etag(current)):
+            raise HTTPException(status_code=412, detail="Item has been modified")
+
+    db_item = await crud.update_item(db=db, item_id=item_id, item=item)
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
+    response.headers["ETag"] = item_etag(db_item)
     return db_item
 
 # DELETE operation
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_item(item_id: int, db: Session = Depends(get_db)):
+async def delete_item(item_id: int, db: AnySession = Depends(get_session)):
     """Delete a specific item"""
-    success = crud.delete_item(db=db, item_id=item_id)
+    success = await crud.delete_item(db=db, item_id=item_id)
     if not success:
         raise HTTPException(status_code=404, detail="Item not found")
     return None
\ No newline at end of file
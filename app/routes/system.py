@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.crud.aio import AnySession
+from app.database import (
+    DB_REPLICA_POLICY, get_async_engine, get_engine, get_engines, get_replicas, get_session, pool_status,
+)
+import app.cache as cache
+import app.crud.aio as crud
+import app.storage as storage
+
+router = APIRouter(
+    prefix="/api/system",
+    tags=["system"],
+)
+
+@router.get("/ready")
+async def read_readiness(db: AnySession = Depends(get_session)):
+    """Readiness probe: succeeds once the app is up and can reach the database"""
+    try:
+        await crud.run(db, storage.item_storage.ping)
+    except SQLAlchemyError:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Database unavailable")
+    return {"status": "ready"}
+
+@router.get("/pool")
+async def read_pool_status():
+    """Get live connection pool statistics"""
+    engine = get_engine()
+    if engine is None:
+        # The in-memory backend has no connections
+        return {}
+    pools = {"sync": pool_status(engine)}
+    engines = get_engines()
+    if len(engines) > 1:
+        pools["shards"] = [pool_status(engine) for engine in engines]
+    async_engine = get_async_engine()
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine.sync_engine)
+    return pools
+
+@router.get("/replicas")
+async def read_replica_status():
+    """Get read replica health and how many reads each one served"""
+    replicas = get_replicas()
+    return {
+        "policy": DB_REPLICA_POLICY,
+        "replicas": replicas.status() if replicas is not None else [],
+    }
+
+@router.get("/cache")
+async def read_cache_stats():
+    """Get item cache hit, miss and eviction counters"""
+    return cache.item_cache.stats()
@@ -1 +1 @@
-from app.schemas.item import Item, ItemCreate, ItemBase
\ No newline at end of file
+from app.schemas.item import Item, ItemCreate, ItemBase, BulkResult, ImportResult, ImportRowError
\ No newline at end of file
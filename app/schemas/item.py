@@ -1,9 +1,10 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class ItemBase(BaseModel):
-    title: str
-    description: Optional[str] = None
+    # Same limits as the items table columns, so long values are rejected up front
+    title: str = Field(max_length=255)
+    description: Optional[str] = Field(None, max_length=1000)
     completed: bool = False
 
 class ItemCreate(ItemBase):
@@ -13,4 +14,21 @@ class Item(ItemBase):
     id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class BulkResult(BaseModel):
+    id: int
+    status: str
+
+class ItemCount(BaseModel):
+    count: int
+    approximate: bool = False
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+class ImportResult(BaseModel):
+    accepted: int
+    rejected: int
+    errors: List[ImportRowError]
\ No newline at end of file
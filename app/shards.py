@@ -0,0 +1,136 @@
+import contextvars
+import heapq
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from sqlalchemy.orm import Session
+from app.ids import ID_EPOCH_MS, SEQUENCE_BITS, WORKER_BITS
+from app.replicas import REPLICA_READ
+
+# IDs below this have no Snowflake timestamp, so they can only be AUTO_INCREMENT
+# rows from before the table was sharded, which stay on shard 0 where they were written
+LEGACY_ID_LIMIT = 1 << (WORKER_BITS + SEQUENCE_BITS)
+
+def _first_snowflake_id() -> int:
+    """Smallest Snowflake ID that can be generated from now on"""
+    return (time.time_ns() // 1_000_000 - ID_EPOCH_MS) << (WORKER_BITS + SEQUENCE_BITS)
+
+def _mix(item_id: int) -> int:
+    """
+    Scramble an ID with the splitmix64 finalizer.
+
+    Snowflake IDs end in a per-millisecond sequence that is usually 0 at low
+    write rates, so a plain modulo would send almost every item to shard 0.
+    """
+    x = item_id & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return x ^ (x >> 31)
+
+class ShardRouter:
+    """
+    Map item IDs to the database shard that stores them.
+
+    Statements about one item carry {"shard": n} in their bind_arguments,
+    which RoutingSession turns into that shard's engine. Queries over all
+    items run on every shard through fan_out and are merged by ID.
+    IDs from before sharding (up to legacy_max_id, and anything below
+    LEGACY_ID_LIMIT) always map to shard 0.
+
+    Args:
+        engines (list): Sync engines (or async engines' sync_engine), shard 0 first
+        strategy (str): "hash" (spread IDs evenly) or "range" (split at bounds)
+        bounds (Sequence[int]): For "range", the first ID of shards 1..n-1, ascending
+        max_workers (int): Shard queries run at once by all fan-outs together;
+            defaults to one per shard
+        legacy_max_id (int): Largest AUTO_INCREMENT ID in the table when it was sharded
+    """
+
+    def __init__(self, engines: list, strategy: str = "hash", bounds: Sequence[int] = (),
+                 max_workers: Optional[int] = None, legacy_max_id: int = 0):
+        if strategy not in ("hash", "range"):
+            raise ValueError(f"Unknown shard strategy: {strategy}")
+        if strategy == "range" and (len(bounds) != len(engines) - 1 or list(bounds) != sorted(bounds)):
+            raise ValueError("Range sharding needs one ascending bound per shard after the first")
+        # Every ID up to here is a pre-sharding ID and lives on shard 0
+        self.legacy_max_id = max(legacy_max_id, LEGACY_ID_LIMIT - 1)
+        if self.legacy_max_id >= _first_snowflake_id():
+            raise ValueError("The legacy max ID overlaps the Snowflake IDs that new items get")
+        if strategy == "range" and bounds and bounds[0] <= self.legacy_max_id:
+            raise ValueError(f"Range shard bounds must be above {self.legacy_max_id}; lower IDs stay on shard 0")
+        self.engines = engines
+        self.strategy = strategy
+        self.bounds = list(bounds)
+        # Async engines can only be driven from the event loop's greenlet, so they fan out one at a time
+        self.parallel = not engines[0].dialect.is_async
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(engines), thread_name_prefix="shard",
+        ) if self.parallel else None
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def shard_for(self, item_id: int) -> int:
+        if item_id <= self.legacy_max_id:
+            return 0
+        if self.strategy == "range":
+            return bisect_right(self.bounds, item_id)
+        return _mix(item_id) % len(self.engines)
+
+    def group(self, item_ids: Iterable[int]) -> Dict[int, List[int]]:
+        """Split IDs by shard, keeping their order within each shard"""
+        groups: Dict[int, List[int]] = {}
+        for item_id in item_ids:
+            groups.setdefault(self.shard_for(item_id), []).append(item_id)
+        return groups
+
+    def fan_out(self, db: Session, fn: Callable[..., Any]) -> List[Any]:
+        """
+        Run fn(connection) on every shard and return the results in shard order.
+
+        With sync engines each shard runs on its own pooled connection in
+        parallel, in a copy of the caller's context so the queries still
+        count towards the current request's stats. With async engines the
+        shards are queried one after another through the session.
+
+        Args:
+            db (Session): Session of the request
+            fn (Callable): Called with a Connection to one shard
+        """
+        if not self.parallel:
+            return [fn(db.connection(bind_arguments={"shard": shard})) for shard in range(len(self.engines))]
+
+        def run(engine):
+            with engine.connect() as connection:
+                return fn(connection)
+
+        futures = [
+            self._executor.submit(contextvars.copy_context().run, run, engine) for engine in self.engines
+        ]
+        return [future.result() for future in futures]
+
+def get_shards(db: Session) -> Optional[ShardRouter]:
+    """The shard router of a session, or None if the items table is not sharded"""
+    return getattr(db, "shards", None)
+
+def item_bind(db: Session, item_id: int, replica: bool = False) -> Optional[dict]:
+    """
+    bind_arguments for a statement about one item.
+
+    Args:
+        db (Session): Database session
+        item_id (int): ID of the item the statement reads or writes
+        replica (bool): The statement is a plain read that a replica may serve
+
+    Returns:
+        Optional[dict]: The owning shard when sharded, otherwise REPLICA_READ or None
+    """
+    shards = get_shards(db)
+    if shards is not None:
+        return {"shard": shards.shard_for(item_id)}
+    return REPLICA_READ if replica else None
+
+def merge_by_id(results: List[List[tuple]], descending: bool = False) -> Iterable[tuple]:
+    """Merge per-shard row lists (or iterators) already sorted by ID, keyed on the first column"""
+    return heapq.merge(*results, key=lambda row: row[0], reverse=descending)
@@ -0,0 +1,188 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from app.config import env_flag
+import app.metrics as metrics
+
+# Concurrent identical item reads in one worker share a single query and result
+COALESCE_READS = env_flag("COALESCE_READS", True)
+# Storage operations whose concurrent identical calls are coalesced
+COALESCED_OPERATIONS = ("get_item", "get_items", "get_item_dicts")
+
+COALESCED_CALLS = metrics.Counter(
+    "read_coalescing_calls_total",
+    "Item reads by whether they ran their own query (leader) or shared one already in flight (shared)",
+    ("operation", "outcome"),
+)
+metrics.REGISTRY.append(COALESCED_CALLS)
+
+class _Call:
+    """A sync call in flight; followers wait on done and read result or error."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one.
+
+    The first caller for a key (the leader) runs the function; callers with
+    the same key arriving before it returns wait and get the same result, or
+    the same exception. Once the call returns the key is free again, so
+    nothing is cached beyond the call itself.
+
+    Keys are tuples whose first element names the operation, which labels
+    the metrics. Sync callers (threads) and async callers (the event loop)
+    are tracked separately, as a thread cannot wait on a coroutine.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for the identical call already running in another thread.
+
+        Args:
+            key (Hashable): Identifies the call; equal keys must mean equal results
+            fn (Callable): Performs the call
+
+        Returns:
+            Whatever fn returns
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        COALESCED_CALLS.inc(key[0], "leader" if leader else "shared")
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn(), or wait for the identical call already running on the event loop.
+
+        If the leader is cancelled (its client went away), the callers waiting
+        on it are not: one of them runs the call again.
+
+        Args:
+            key (Hashable): Identifies the call; equal keys must mean equal results
+            fn (Callable): Returns the awaitable performing the call
+
+        Returns:
+            Whatever the awaitable returns
+        """
+        while True:
+            with self._lock:
+                future = self._futures.get(key)
+                leader = future is None
+                if leader:
+                    future = self._futures[key] = asyncio.get_running_loop().create_future()
+            if leader:
+                break
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # The leader was cancelled; take over the call
+                    continue
+                raise
+            COALESCED_CALLS.inc(key[0], "shared")
+            return result
+
+        COALESCED_CALLS.inc(key[0], "leader")
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # Mark the exception as retrieved in case nobody was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+
+    def forget(self):
+        """
+        Let calls arriving from now on start afresh instead of joining those in flight.
+
+        Called after every write, so a read that starts after a write
+        committed never gets the result of a query that started before it.
+        Calls already waiting still get their leader's result.
+        """
+        with self._lock:
+            self._calls.clear()
+            self._futures.clear()
+
+def _route(db) -> Optional[str]:
+    """Where the session's reads go: "replica", "primary", or None if pinned to the primary"""
+    # AsyncSession keeps the routing state on its sync session
+    session = getattr(db, "sync_session", db)
+    if getattr(session, "read_primary", False) or getattr(session, "used_primary", False):
+        return None
+    return "replica" if getattr(session, "replicas", None) is not None else "primary"
+
+def read_key(db, operation: str, args: tuple = (), kwargs: Optional[Dict[str, Any]] = None) -> Optional[tuple]:
+    """
+    Build the coalescing key of a storage call, or None if it must run on its own.
+
+    Locking reads (get_item with for_update) belong to the caller's
+    transaction and are never shared, nor is any call with unhashable
+    arguments. Sessions pinned to the primary (X-Read-Primary, or after a
+    write) are promised read-your-writes, which a query started before
+    their write could break, so they never join another call either.
+
+    Args:
+        db: Session the call would run on
+        operation (str): Name of the storage operation, e.g. "get_item"
+        args (tuple): Positional arguments after the session
+        kwargs (dict): Keyword arguments
+
+    Returns:
+        Optional[tuple]: The key, or None
+    """
+    if not COALESCE_READS or operation not in COALESCED_OPERATIONS:
+        return None
+    kwargs = kwargs or {}
+    if operation == "get_item" and (kwargs.get("for_update") or (len(args) > 1 and args[1])):
+        return None
+    route = _route(db)
+    if route is None:
+        return None
+    key = (operation, route, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+# Shared by app.crud (sync callers) and app.crud.aio (async callers)
+item_reads = SingleFlight()
@@ -0,0 +1,320 @@
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import text
+from app.database import DB_BACKEND
+from app.models.item import Item
+from app.schemas.item import BulkResult, ItemCreate
+from app.schemas.item import Item as ItemSchema
+from app.shards import get_shards
+import app.crud.bulk as bulk
+import app.crud.create as create
+import app.crud.delete as delete
+import app.crud.read as read
+import app.crud.update as update
+
+# Operations every backend provides; app.crud.<name> calls the configured backend
+OPERATIONS = (
+    "create_item", "get_item", "get_items", "get_item_dicts", "count_items", "stream_items",
+    "explain_items", "update_item", "delete_item", "create_items", "update_items", "delete_items",
+    "ping",
+)
+
+class ItemStorage(ABC):
+    """
+    Interface of an item store.
+
+    Every operation takes the session from app.database.get_session (or
+    get_sessionmaker) as its first argument, followed by the same keyword
+    arguments as the SQL implementation in app.crud's submodules, whose
+    docstrings describe them. Changes are committed before an operation returns.
+    A backend must implement every operation; one that does not cannot be
+    instantiated.
+    """
+
+    name = "none"
+    # Operations wait on I/O, so async callers run them in the threadpool
+    blocking = True
+
+    @abstractmethod
+    def create_item(self, db, item: ItemCreate) -> Item:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_item(self, db, item_id: int, for_update: bool = False) -> Optional[Item]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_items(self, db, **filters) -> List[Item]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_item_dicts(self, db, **filters) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_items(self, db, **filters) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_items(self, db, chunk_size: int = 1000) -> Iterator[tuple]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def explain_items(self, db, **filters) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_item(self, db, item_id: int, item: ItemCreate) -> Optional[Item]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_item(self, db, item_id: int) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_items(self, db, items: List[ItemCreate]) -> List[Item]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_items(self, db, items: List[ItemSchema]) -> List[BulkResult]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_items(self, db, item_ids: List[int]) -> List[BulkResult]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def ping(self, db):
+        """Raise if the store cannot serve requests"""
+        raise NotImplementedError
+
+class SQLStorage(ItemStorage):
+    """
+    MySQL or SQLite through SQLAlchemy, using the raw SQL in app.crud's submodules.
+
+    The SQL is shared; the few statements MySQL and SQLite spell differently
+    (row locks, full-text search, EXPLAIN) check the session's dialect.
+    """
+
+    create_item = staticmethod(create.create_item)
+    get_item = staticmethod(read.get_item)
+    get_items = staticmethod(read.get_items)
+    get_item_dicts = staticmethod(read.get_item_dicts)
+    count_items = staticmethod(read.count_items)
+    stream_items = staticmethod(read.stream_items)
+    explain_items = staticmethod(read.explain_items)
+    update_item = staticmethod(update.update_item)
+    delete_item = staticmethod(delete.delete_item)
+    create_items = staticmethod(bulk.create_items)
+    update_items = staticmethod(bulk.update_items)
+    delete_items = staticmethod(bulk.delete_items)
+
+    def __init__(self, name: str = "mysql"):
+        self.name = name
+
+    def ping(self, db):
+        shards = get_shards(db)
+        if shards is None:
+            db.execute(text("SELECT 1"))
+            return
+        # Every shard holds part of the items, so all of them must be reachable
+        shards.fan_out(db, lambda connection: connection.execute(text("SELECT 1")))
+
+def _to_item(row: Dict[str, Any]) -> Item:
+    item = Item()
+    item.id = row["id"]
+    item.title = row["title"]
+    item.description = row["description"]
+    item.completed = row["completed"]
+    return item
+
+class MemoryStorage(ItemStorage):
+    """
+    Items kept in a dict inside this process (DATABASE_URL=memory://).
+
+    For tests, demos and single-process edge nodes: nothing is persisted and
+    each worker process has its own items. Item IDs are kept in a sorted
+    list next to the dict, so pages and cursors seek by bisection like the
+    primary key index of the SQL backends. Operations never wait on I/O and
+    async callers run them inline on the event loop, which also makes a
+    read followed by a write in the same request (If-Match) atomic.
+    """
+
+    name = "memory"
+    blocking = False
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        # Every key of _rows, ascending
+        self._ids: List[int] = []
+        self._last_id = 0
+
+    def _insert(self, item: ItemCreate) -> Dict[str, Any]:
+        self._last_id += 1
+        row = {
+            "id": self._last_id,
+            "title": item.title,
+            "description": item.description,
+            "completed": item.completed,
+        }
+        self._rows[row["id"]] = row
+        # IDs only grow, so appending keeps the list sorted
+        self._ids.append(row["id"])
+        return row
+
+    def _remove(self, item_id: int) -> bool:
+        if self._rows.pop(item_id, None) is None:
+            return False
+        del self._ids[bisect_left(self._ids, item_id)]
+        return True
+
+    def _matches(self, row: Dict[str, Any], completed: Optional[bool], title_prefix: Optional[str],
+                 search: Optional[str]) -> bool:
+        if completed is not None and row["completed"] != completed:
+            return False
+        if title_prefix and not row["title"].casefold().startswith(title_prefix.casefold()):
+            return False
+        if search:
+            # Like the SQLite backend: any word, anywhere in the title or description
+            haystack = f"{row['title']}\n{row['description'] or ''}".casefold()
+            if not any(word.casefold() in haystack for word in (search.split() or [search])):
+                return False
+        return True
+
+    def _page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        completed: Optional[bool] = None,
+        title_prefix: Optional[str] = None,
+        search: Optional[str] = None,
+        descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            if descending:
+                end = len(self._ids) if after_id is None else bisect_left(self._ids, after_id)
+                positions = range(end - 1, -1, -1)
+            else:
+                start = 0 if after_id is None else bisect_right(self._ids, after_id)
+                positions = range(start, len(self._ids))
+            if after_id is not None:
+                skip = 0
+            page = []
+            for position in positions:
+                row = self._rows[self._ids[position]]
+                if not self._matches(row, completed, title_prefix, search):
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                page.append(dict(row))
+                if len(page) >= limit:
+                    break
+            return page
+
+    def create_item(self, db, item: ItemCreate) -> Item:
+        with self._lock:
+            return _to_item(self._insert(item))
+
+    def get_item(self, db, item_id: int, for_update: bool = False) -> Optional[Item]:
+        with self._lock:
+            row = self._rows.get(item_id)
+            return _to_item(row) if row is not None else None
+
+    def get_items(self, db, **filters) -> List[Item]:
+        return [_to_item(row) for row in self._page(**filters)]
+
+    def get_item_dicts(self, db, **filters) -> List[Dict[str, Any]]:
+        return self._page(**filters)
+
+    def count_items(self, db, completed: Optional[bool] = None, title_prefix: Optional[str] = None,
+                    search: Optional[str] = None, approximate: bool = False) -> int:
+        with self._lock:
+            if completed is None and not title_prefix and not search:
+                return len(self._rows)
+            return sum(
+                1 for row in self._rows.values() if self._matches(row, completed, title_prefix, search)
+            )
+
+    def stream_items(self, db, chunk_size: int = 1000) -> Iterator[tuple]:
+        position = 0
+        while True:
+            # Copy one chunk at a time so writers are not held up for the whole export
+            with self._lock:
+                ids = self._ids[position:position + chunk_size]
+                rows = [self._rows[item_id] for item_id in ids]
+            if not rows:
+                return
+            position += len(rows)
+            for row in rows:
+                yield row["id"], row["title"], row["description"], row["completed"]
+
+    def explain_items(self, db, **filters) -> List[Dict[str, Any]]:
+        filtered = [name for name in ("completed", "title_prefix", "search") if filters.get(name)]
+        return [{
+            "backend": self.name,
+            "access": "seek on item ID" if filters.get("after_id") is not None else "scan in ID order",
+            "filters": filtered,
+        }]
+
+    def update_item(self, db, item_id: int, item: ItemCreate) -> Optional[Item]:
+        with self._lock:
+            row = self._rows.get(item_id)
+            if row is None:
+                return None
+            row.update(title=item.title, description=item.description, completed=item.completed)
+            return _to_item(row)
+
+    def delete_item(self, db, item_id: int) -> bool:
+        with self._lock:
+            return self._remove(item_id)
+
+    def create_items(self, db, items: List[ItemCreate]) -> List[Item]:
+        with self._lock:
+            return [_to_item(self._insert(item)) for item in items]
+
+    def update_items(self, db, items: List[ItemSchema]) -> List[BulkResult]:
+        with self._lock:
+            # If the same ID appears more than once, the last entry wins
+            for item in items:
+                row = self._rows.get(item.id)
+                if row is not None:
+                    row.update(title=item.title, description=item.description, completed=item.completed)
+            return [
+                BulkResult(id=item.id, status="updated" if item.id in self._rows else "not_found")
+                for item in items
+            ]
+
+    def delete_items(self, db, item_ids: List[int]) -> List[BulkResult]:
+        with self._lock:
+            deleted = {item_id for item_id in item_ids if self._remove(item_id)}
+            return [
+                BulkResult(id=item_id, status="deleted" if item_id in deleted else "not_found")
+                for item_id in item_ids
+            ]
+
+    def ping(self, db):
+        pass
+
+def build_storage(backend: str = DB_BACKEND) -> ItemStorage:
+    """
+    Create the item store selected by DATABASE_URL.
+
+    Args:
+        backend (str): "mysql", "sqlite" or "memory"
+
+    Returns:
+        ItemStorage: The configured store
+    """
+    if backend in ("mysql", "sqlite"):
+        return SQLStorage(backend)
+    if backend == "memory":
+        return MemoryStorage()
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+# Store used by app.crud; replace it to plug in another backend
+item_storage = build_storage()
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
+import select
+import signal
 import sys
 import subprocess
 import threading
 import time
 import socket
+import traceback
+import uvicorn
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -14,6 +19,13 @@ load_dotenv()
 API_HOST = os.getenv("API_HOST", "127.0.0.1")
 API_PORT = int(os.getenv("API_PORT", 8000))
 
+# Seconds check_api_server waits for the readiness probe to pass
+READY_TIMEOUT = float(os.getenv("READY_TIMEOUT", 30))
+# Seconds a new worker may take to start before a rolling restart gives up on it
+WORKER_BOOT_TIMEOUT = float(os.getenv("WORKER_BOOT_TIMEOUT", 30))
+# Seconds a worker gets to finish in-flight requests before it is killed
+WORKER_GRACEFUL_TIMEOUT = int(os.getenv("WORKER_GRACEFUL_TIMEOUT", 30))
+
 def is_port_in_use(port, host='127.0.0.1'):
     """Check if a port is already in use"""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -54,31 +66,233 @@ def start_api_server():
         ["uvicorn", "app.main:app", "--host", API_HOST, "--port", str(API_PORT), 
          "--log-level", "error", "--no-access-log"],
         stdout=subprocess.DEVNULL,  # Suppress standard output
-        stderr=sys.stderr  # Keep stderr for error messages
+        stderr=sys.stderr,  # Keep stderr for error messages
+        # Request log lines go to stderr too and would land in the middle of the CLI's screen
+        env=dict(os.environ, LOG_REQUESTS="false"),
     )
     return True
 
-def check_api_server():
-    """Check if API server is running"""
+def check_api_server(timeout=READY_TIMEOUT):
+    """Wait until the API server's readiness probe passes, backing off between attempts"""
     import requests
-    max_attempts = 5
-    attempts = 0
-    while attempts < max_attempts:
+    url = f"http://{API_HOST}:{API_PORT}/api/system/ready"
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    reason = "no response"
+    print("Waiting for API server to start...")
+    while True:
         try:
-            response = requests.get(f"http://{API_HOST}:{API_PORT}")
+            response = requests.get(url, timeout=2)
             if response.status_code == 200:
                 print("API server is running.")
                 return True
-        except:
-            pass
+            reason = response.json().get("detail", f"HTTP {response.status_code}")
+        except (requests.RequestException, ValueError) as e:
+            reason = str(e)
         
-        attempts += 1
-        print(f"Waiting for API server to start (attempt {attempts}/{max_attempts})...")
-        time.sleep(1)
+        if time.monotonic() + delay > deadline:
+            break
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
     
-    print("Failed to connect to API server.")
+    print(f"Failed to connect to API server: {reason}")
     return False
 
+class _NotifyingServer(uvicorn.Server):
+    """uvicorn server that reports through a pipe once it accepts connections"""
+    
+    def __init__(self, config, ready_fd):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+    
+    async def startup(self, sockets=None):
+        await super().startup(sockets=sockets)
+        if self.started:
+            try:
+                os.write(self.ready_fd, b"1")
+                os.close(self.ready_fd)
+            except OSError:
+                pass
+
+class WorkerSupervisor:
+    """
+    Pre-fork process manager for serving the API on every core.
+    
+    The listening socket is bound once here and inherited by each forked
+    worker, so the kernel spreads connections across them. The application is
+    only imported inside the workers, which gives each one its own engine and
+    connection pool and lets a restart pick up new code.
+    
+    Signals:
+        SIGHUP: rolling restart, one worker at a time. Each replacement must
+            report ready before the worker it replaces is stopped, so the
+            socket is never left without workers.
+        SIGTERM / SIGINT: stop all workers gracefully and exit.
+    Workers that die unexpectedly are replaced.
+    """
+    
+    def __init__(self, host, port, workers, log_level="info"):
+        self.host = host
+        self.port = port
+        self.num_workers = max(1, workers)
+        self.log_level = log_level
+        self.sock = None
+        # pid -> start time
+        self.workers = {}
+        # pid -> slot; each live worker gets the lowest free slot, which it
+        # adds to ID_WORKER_ID so concurrent workers never share an ID generator
+        self.slots = {}
+        self._reload = False
+        self._stop = False
+    
+    def log(self, message):
+        print(f"[supervisor {os.getpid()}] {message}", file=sys.stderr, flush=True)
+    
+    def bind(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((self.host, self.port))
+        self.sock.listen(2048)
+        self.sock.set_inheritable(True)
+    
+    def spawn(self):
+        """Fork a worker; returns its pid and a pipe that becomes readable once it is serving"""
+        ready_r, ready_w = os.pipe()
+        used = set(self.slots.values())
+        slot = next(n for n in range(len(used) + 1) if n not in used)
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            os.environ["ID_WORKER_ID"] = str(int(os.getenv("ID_WORKER_ID", 0)) + slot)
+            for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+                signal.signal(sig, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                config = uvicorn.Config(
+                    "app.main:app",
+                    # "auto" picks uvloop and httptools when they are installed
+                    loop="auto",
+                    http="auto",
+                    log_level=self.log_level,
+                    access_log=False,
+                    timeout_graceful_shutdown=WORKER_GRACEFUL_TIMEOUT,
+                )
+                _NotifyingServer(config, ready_w).run(sockets=[self.sock])
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        
+        os.close(ready_w)
+        self.workers[pid] = time.monotonic()
+        self.slots[pid] = slot
+        return pid, ready_r
+    
+    def wait_ready(self, ready_fd, timeout):
+        """Wait for a worker to report it is serving; False if it exited or timed out first"""
+        try:
+            readable, _, _ = select.select([ready_fd], [], [], timeout)
+            return bool(readable) and os.read(ready_fd, 1) == b"1"
+        finally:
+            os.close(ready_fd)
+    
+    def retire(self, pid):
+        """Stop a worker gracefully, killing it if it outlives the graceful timeout"""
+        self.workers.pop(pid, None)
+        # Safe to reuse right away: no worker is spawned until this one has exited
+        self.slots.pop(pid, None)
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        deadline = time.monotonic() + WORKER_GRACEFUL_TIMEOUT + 5
+        while time.monotonic() < deadline:
+            try:
+                if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                    return
+            except ChildProcessError:
+                return
+            time.sleep(0.05)
+        self.log(f"Worker {pid} did not stop in time, killing it")
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+    
+    def rolling_restart(self):
+        self.log(f"Rolling restart of {len(self.workers)} workers")
+        for old_pid in list(self.workers):
+            new_pid, ready_fd = self.spawn()
+            if not self.wait_ready(ready_fd, WORKER_BOOT_TIMEOUT):
+                self.log(f"Worker {new_pid} failed to start, keeping the remaining old workers")
+                self.retire(new_pid)
+                return
+            self.retire(old_pid)
+        self.log("Rolling restart complete")
+    
+    def reap(self):
+        """Collect exited workers and replace them"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            started = self.workers.pop(pid, None)
+            self.slots.pop(pid, None)
+            if started is None or self._stop:
+                continue
+            self.log(f"Worker {pid} exited with code {os.waitstatus_to_exitcode(status)}, starting a replacement")
+            # Avoid a tight fork loop when workers crash on startup
+            if time.monotonic() - started < 1:
+                time.sleep(1)
+            os.close(self.spawn()[1])
+    
+    def stop_all(self):
+        self.log(f"Stopping {len(self.workers)} workers")
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.workers.pop(pid)
+                self.slots.pop(pid, None)
+        for pid in list(self.workers):
+            self.retire(pid)
+    
+    def run(self):
+        """Serve until SIGTERM/SIGINT; returns the process exit code"""
+        self.bind()
+        signal.signal(signal.SIGHUP, lambda *_: setattr(self, "_reload", True))
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, "_stop", True))
+        signal.signal(signal.SIGINT, lambda *_: setattr(self, "_stop", True))
+        
+        pending = [self.spawn()[1] for _ in range(self.num_workers)]
+        deadline = time.monotonic() + WORKER_BOOT_TIMEOUT
+        ready = sum(self.wait_ready(fd, max(deadline - time.monotonic(), 0)) for fd in pending)
+        if not ready:
+            self.log("No worker started, exiting")
+            self._stop = True
+            self.stop_all()
+            return 1
+        self.log(f"{ready}/{self.num_workers} workers serving on http://{self.host}:{self.port}")
+        
+        while not self._stop:
+            if self._reload:
+                self._reload = False
+                self.rolling_restart()
+            self.reap()
+            time.sleep(0.2)
+        
+        self.stop_all()
+        return 0
+
+def serve(host=API_HOST, port=API_PORT, workers=None, log_level="info"):
+    """Run the API in production mode with one worker per CPU by default"""
+    if not hasattr(os, "fork"):
+        print("Multi-worker mode needs os.fork; run uvicorn directly on this platform.")
+        return 1
+    return WorkerSupervisor(host, port, workers or os.cpu_count() or 1, log_level).run()
+
 def start_cli():
     """Start the CLI application"""
     from cli.cli import CrudCLI
@@ -86,7 +300,20 @@ def start_cli():
     cli = CrudCLI(api_port=API_PORT)
     cli.run()
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Start the API server and the CRUD CLI")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    serve_parser = subparsers.add_parser("serve", help="Serve the API with several worker processes (no CLI)")
+    serve_parser.add_argument("--host", default=API_HOST, help="Address to bind (defaults to API_HOST)")
+    serve_parser.add_argument("--port", type=int, default=API_PORT, help="Port to bind (defaults to API_PORT)")
+    serve_parser.add_argument("--workers", type=int, help="Worker processes (defaults to the CPU count)")
+    serve_parser.add_argument("--log-level", default="info", help="uvicorn log level")
+    
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        sys.exit(serve(args.host, args.port, args.workers, args.log_level))
+    
     # Start API server first
     if not start_api_server():
         sys.exit(1)
@@ -97,4 +324,7 @@ if __name__ == "__main__":
         start_cli()
     else:
         print("Failed to start API server. Exiting.")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Load-test and benchmark suite for the item API and CRUD layer.
+
+Runs every scenario at each table size and concurrency level and writes
+p50/p95/p99 latency and requests/s to a JSON file that can be diffed
+between commits with benchmarks/compare.py.
+
+Modes:
+    asgi  In-process ASGI client (httpx), no network or server needed
+    crud  Direct calls into app.crud from a thread pool
+    http  Multi-process HTTP load generator against a running server (--url)
+
+Examples:
+    python -m benchmarks.bench_api
+    python -m benchmarks.bench_api --rows 1000,100000 --concurrency 1,16,64
+    python -m benchmarks.bench_api --mode http --url http://127.0.0.1:8000 --processes 4
+
+In asgi and crud modes the items table is dropped and reseeded before every
+run. In http mode the server's database cannot be reset, so each run adds
+--rows items through the bulk endpoint instead.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Make the repository root importable when run as a script
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+API_PREFIX = "/api/items/"
+
+# Scenario name -> builder returning (method, path, json body) for one request.
+# Builders receive a seeded RNG and the shared state with the known item IDs.
+Request = Tuple[str, str, Optional[object]]
+
+def _random_id(rng: random.Random, state: dict) -> int:
+    return rng.choice(state["ids"])
+
+def _new_item(rng: random.Random) -> dict:
+    return {
+        "title": f"bench {rng.randrange(1_000_000)}",
+        "description": "benchmark item",
+        "completed": rng.random() < 0.5,
+    }
+
+SCENARIOS: Dict[str, Callable[[random.Random, dict], Request]] = {
+    "create_item": lambda rng, state: ("POST", API_PREFIX, _new_item(rng)),
+    "read_item": lambda rng, state: ("GET", f"{API_PREFIX}{_random_id(rng, state)}", None),
+    "read_items_offset": lambda rng, state: (
+        "GET", f"{API_PREFIX}?limit=100&skip={rng.randrange(max(len(state['ids']) - 100, 1))}", None
+    ),
+    "read_items_cursor": lambda rng, state: (
+        "GET", f"{API_PREFIX}?limit=100&cursor={state['encode_cursor'](_random_id(rng, state))}", None
+    ),
+    "read_items_completed": lambda rng, state: ("GET", f"{API_PREFIX}?limit=100&completed=true", None),
+    "update_item": lambda rng, state: ("PUT", f"{API_PREFIX}{_random_id(rng, state)}", _new_item(rng)),
+    "bulk_create_100": lambda rng, state: ("POST", f"{API_PREFIX}bulk", [_new_item(rng) for _ in range(100)]),
+    # Deletes consume IDs so every request removes a row that exists
+    "delete_item": lambda rng, state: ("DELETE", f"{API_PREFIX}{state['deletable'].pop()}", None),
+}
+
+# CRUD-layer equivalents, called with a fresh session per operation
+def _crud_scenarios():
+    import app.crud as crud
+    from app.schemas.item import ItemCreate
+
+    return {
+        "create_item": lambda db, rng, state: crud.create_item(db, ItemCreate(**_new_item(rng))),
+        "read_item": lambda db, rng, state: crud.get_item(db, _random_id(rng, state)),
+        "read_items_offset": lambda db, rng, state: crud.get_items(
+            db, skip=rng.randrange(max(len(state["ids"]) - 100, 1)), limit=100
+        ),
+        "read_items_cursor": lambda db, rng, state: crud.get_items(
+            db, after_id=_random_id(rng, state), limit=100
+        ),
+        "read_items_completed": lambda db, rng, state: crud.get_items(db, completed=True, limit=100),
+        "update_item": lambda db, rng, state: crud.update_item(
+            db, _random_id(rng, state), ItemCreate(**_new_item(rng))
+        ),
+        "delete_item": lambda db, rng, state: crud.delete_item(db, state["deletable"].pop()),
+    }
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    """Turn raw per-request latencies (seconds) into the reported statistics."""
+    if not latencies:
+        return {"requests": 0, "errors": errors, "rps": 0.0}
+    ordered = sorted(latencies)
+    cuts = statistics.quantiles(ordered, n=100, method="inclusive") if len(ordered) > 1 else ordered * 99
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "rps": round(len(ordered) / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+# ---------------------------------------------------------------------------
+# Database setup
+# ---------------------------------------------------------------------------
+
+def seed_items(rows: int, seed: int) -> List[int]:
+    """Reset the items table to exactly `rows` rows and return their IDs."""
+    from sqlalchemy import text
+    from app.database import DB_BACKEND
+
+    if DB_BACKEND == "memory":
+        import app.storage as storage
+        from app.schemas.item import ItemCreate
+
+        rng = random.Random(seed)
+        storage.item_storage = storage.build_storage()
+        items = storage.item_storage.create_items(None, [ItemCreate(**_new_item(rng)) for _ in range(rows)])
+        return [item.id for item in items]
+
+    from app.database import Base, SessionLocal, engine
+    import app.models.item  # noqa: F401  (registers the table)
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    rng = random.Random(seed)
+    insert = text("INSERT INTO items (title, description, completed) VALUES (:title, :description, :completed)")
+    db = SessionLocal()
+    try:
+        for start in range(0, rows, 5000):
+            batch = [_new_item(rng) for _ in range(min(5000, rows - start))]
+            db.execute(insert, batch)
+        db.commit()
+        return [row[0] for row in db.execute(text("SELECT id FROM items ORDER BY id"))]
+    finally:
+        db.close()
+
+def reset_cache():
+    """Start every scenario with a cold item cache."""
+    import app.cache as cache
+    cache.item_cache = cache.build_cache()
+
+# ---------------------------------------------------------------------------
+# In-process ASGI mode
+# ---------------------------------------------------------------------------
+
+async def _run_asgi(client, scenario: str, state: dict, concurrency: int, total: int, seed: int) -> dict:
+    build = SCENARIOS[scenario]
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker(worker_id: int):
+        nonlocal remaining, errors
+        rng = random.Random(seed * 1000 + worker_id)
+        while remaining > 0:
+            remaining -= 1
+            method, path, body = build(rng, state)
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+def run_asgi(scenario: str, state: dict, concurrency: int, total: int, seed: int) -> dict:
+    import httpx
+    from app.main import app
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await _run_asgi(client, scenario, state, concurrency, total, seed)
+
+    return asyncio.run(main())
+
+# ---------------------------------------------------------------------------
+# Direct CRUD mode
+# ---------------------------------------------------------------------------
+
+def run_crud(scenario: str, state: dict, concurrency: int, total: int, seed: int) -> dict:
+    from app.database import SessionLocal
+
+    operation = _crud_scenarios().get(scenario)
+    if operation is None:
+        return None
+
+    def one(index: int) -> Tuple[float, bool]:
+        rng = random.Random(seed * 1000 + index)
+        db = SessionLocal()
+        start = time.perf_counter()
+        try:
+            operation(db, rng, state)
+            ok = True
+        except Exception:
+            ok = False
+        finally:
+            db.close()
+        return time.perf_counter() - start, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+    return summarize([r[0] for r in results], sum(1 for r in results if not r[1]), elapsed)
+
+# ---------------------------------------------------------------------------
+# Multi-process HTTP mode
+# ---------------------------------------------------------------------------
+
+def _http_process(args) -> Tuple[List[float], int]:
+    """Load generator process: `threads` keep-alive clients sharing `total` requests."""
+    url, scenario, state, threads, total, seed = args
+    import requests
+    from app.pagination import encode_cursor
+
+    state = dict(state, encode_cursor=encode_cursor)
+    build = SCENARIOS[scenario]
+
+    local = threading.local()
+
+    def one(index: int) -> Tuple[float, bool]:
+        # One keep-alive session per load generator thread
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        rng = random.Random(seed * 100_000 + index)
+        method, path, body = build(rng, state)
+        start = time.perf_counter()
+        try:
+            ok = session.request(method, url + path, json=body).status_code < 400
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(one, range(total)))
+    return [r[0] for r in results], sum(1 for r in results if not r[1])
+
+def run_http(url: str, processes: int, scenario: str, state: dict, concurrency: int, total: int, seed: int) -> dict:
+    processes = max(1, min(processes, concurrency))
+    threads = max(1, concurrency // processes)
+    per_process = total // processes
+    # Give each process its own slice of deletable IDs so they never collide
+    jobs = []
+    for p in range(processes):
+        process_state = {"ids": state["ids"]}
+        if scenario == "delete_item":
+            process_state["deletable"] = [state["deletable"].pop() for _ in range(per_process)]
+        jobs.append((url, scenario, process_state, threads, per_process, seed + p))
+
+    started = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(_http_process, jobs)
+    elapsed = time.perf_counter() - started
+    return summarize([lat for r in results for lat in r[0]], sum(r[1] for r in results), elapsed)
+
+def seed_items_http(url: str, rows: int, seed: int) -> List[int]:
+    """Add `rows` items through the bulk endpoint of a running server and return their IDs."""
+    import requests
+
+    rng = random.Random(seed)
+    ids: List[int] = []
+    with requests.Session() as session:
+        for start in range(0, rows, 1000):
+            batch = [_new_item(rng) for _ in range(min(1000, rows - start))]
+            response = session.post(f"{url}{API_PREFIX}bulk", json=batch)
+            response.raise_for_status()
+            ids.extend(item["id"] for item in response.json())
+    return ids
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the item API and CRUD layer")
+    parser.add_argument("--mode", choices=["asgi", "crud", "http"], default="asgi")
+    parser.add_argument(
+        "--database-url", help="Database to benchmark, e.g. memory:// (default: a temporary SQLite file)"
+    )
+    parser.add_argument(
+        "--allow-reset", action="store_true",
+        help="Allow dropping and reseeding the items table of a MySQL --database-url",
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server for --mode http")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Load generator processes for --mode http")
+    parser.add_argument("--rows", type=_int_list, default=[1000, 10000], help="Comma-separated table sizes")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 8, 32], help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario and concurrency level")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = [name for name in args.scenarios.split(",") if name]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    temp_dir = None
+    if args.mode != "http":
+        # The database must be chosen before app.database is imported
+        if args.database_url:
+            if not args.database_url.startswith(("sqlite", "memory:")) and not args.allow_reset:
+                sys.exit("Benchmarks drop and reseed the items table; pass --allow-reset to use this database")
+            os.environ["DATABASE_URL"] = args.database_url
+        else:
+            temp_dir = tempfile.TemporaryDirectory()
+            os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(temp_dir.name, 'bench.db')}"
+
+    from app.pagination import encode_cursor
+
+    results = []
+    for rows in args.rows:
+        for scenario in scenarios:
+            for concurrency in args.concurrency:
+                # Reseed so every scenario starts from the same table
+                if args.mode == "http":
+                    ids = seed_items_http(args.url, rows, args.seed)
+                else:
+                    ids = seed_items(rows, args.seed)
+                    reset_cache()
+                state = {"ids": ids, "deletable": list(ids), "encode_cursor": encode_cursor}
+                total = min(args.requests, len(ids)) if scenario == "delete_item" else args.requests
+
+                if args.mode == "asgi":
+                    stats = run_asgi(scenario, state, concurrency, total, args.seed)
+                elif args.mode == "crud":
+                    stats = run_crud(scenario, state, concurrency, total, args.seed)
+                else:
+                    stats = run_http(args.url, args.processes, scenario, state, concurrency, total, args.seed)
+                if stats is None:
+                    continue
+
+                result = {"scenario": scenario, "rows": rows, "concurrency": concurrency, **stats}
+                results.append(result)
+                print(
+                    f"{scenario:<22} rows={rows:<8} c={concurrency:<4} "
+                    f"rps={stats['rps']:>9.1f}  p50={stats.get('p50_ms', 0):>8.2f}ms  "
+                    f"p95={stats.get('p95_ms', 0):>8.2f}ms  p99={stats.get('p99_ms', 0):>8.2f}ms  "
+                    f"errors={stats['errors']}",
+                    flush=True,
+                )
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "mode": args.mode,
+            "database": (args.url if args.mode == "http" else os.environ["DATABASE_URL"].split(":")[0]),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "requests": args.requests,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if temp_dir is not None:
+        temp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark: how long a fresh worker takes to import the app
+and to answer its first request.
+
+Each run uses a new Python process, so nothing is cached in memory between
+runs. Pass --max-import-ms / --max-first-request-ms to fail (exit code 1)
+when the medians exceed a budget, e.g. in CI.
+
+Examples:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 10 --max-import-ms 1500
+    python -m benchmarks.bench_startup --importtime   # slowest imports
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+# Make the repository root importable when run as a script
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.bench_api import _git_commit
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - start)"
+)
+
+def measure_import(env: dict) -> float:
+    """Seconds to import app.main in a fresh interpreter"""
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, env=env, text=True)
+    return float(output.strip().splitlines()[-1])
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _wait_for(url: str, deadline: float) -> Optional[float]:
+    import requests
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return time.monotonic()
+        except requests.RequestException:
+            pass
+        time.sleep(0.005)
+    return None
+
+def measure_first_request(env: dict, timeout: float) -> dict:
+    """Seconds from starting uvicorn to the first 200 from / and from the readiness probe"""
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    start = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        first = _wait_for(f"{base}/", start + timeout)
+        ready = _wait_for(f"{base}/api/system/ready", start + timeout) if first else None
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        "first_request": first - start if first else None,
+        "ready": ready - start if ready else None,
+    }
+
+def print_slowest_imports(env: dict, count: int = 15):
+    """Show the modules with the largest cumulative import time (python -X importtime)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, env=env, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    print(f"{'cumulative ms':>13}  module")
+    for cumulative_us, module in sorted(rows, reverse=True)[:count]:
+        print(f"{cumulative_us / 1000:>13.1f}  {module}")
+
+def _median_ms(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values) * 1000, 1) if values else None
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure app import time and time to first request")
+    parser.add_argument("--database-url", help="Database the app connects to (default: a temporary SQLite file)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for the server to answer")
+    parser.add_argument("--max-import-ms", type=float, help="Fail if the median import time exceeds this")
+    parser.add_argument("--max-first-request-ms", type=float, help="Fail if the median time to first request exceeds this")
+    parser.add_argument("--importtime", action="store_true", help="Also list the slowest imports")
+    parser.add_argument("--output", help="JSON results file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    temp_dir = None
+    env = dict(os.environ, LOG_REQUESTS="false")
+    if args.database_url:
+        env["DATABASE_URL"] = args.database_url
+    else:
+        temp_dir = tempfile.TemporaryDirectory()
+        env["DATABASE_URL"] = f"sqlite:///{os.path.join(temp_dir.name, 'startup.db')}"
+
+    imports = [measure_import(env) for _ in range(args.runs)]
+    servers = [measure_first_request(env, args.timeout) for _ in range(args.runs)]
+
+    summary = {
+        "import_ms": _median_ms(imports),
+        "import_min_ms": round(min(imports) * 1000, 1),
+        "first_request_ms": _median_ms([s["first_request"] for s in servers]),
+        "ready_ms": _median_ms([s["ready"] for s in servers]),
+        "failed_starts": sum(1 for s in servers if s["first_request"] is None),
+    }
+    for key, value in summary.items():
+        print(f"{key:<18} {value}")
+
+    if args.importtime:
+        print()
+        print_slowest_imports(env)
+
+    if args.output:
+        report = {
+            "meta": {
+                "commit": _git_commit(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "database": env["DATABASE_URL"].split(":")[0],
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "runs": args.runs,
+            },
+            "results": summary,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if temp_dir is not None:
+        temp_dir.cleanup()
+
+    failures = []
+    if args.max_import_ms is not None and summary["import_ms"] > args.max_import_ms:
+        failures.append(f"import {summary['import_ms']} ms > {args.max_import_ms} ms")
+    if args.max_first_request_ms is not None and (
+        summary["first_request_ms"] is None or summary["first_request_ms"] > args.max_first_request_ms
+    ):
+        failures.append(f"first request {summary['first_request_ms']} ms > {args.max_first_request_ms} ms")
+    if failures:
+        sys.exit("Startup budget exceeded: " + "; ".join(failures))
+
+if __name__ == "__main__":
+    main()
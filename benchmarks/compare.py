@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files written by benchmarks/bench_api.py.
+
+Example:
+    python -m benchmarks.compare before.json after.json
+"""
+
+import argparse
+import json
+import sys
+
+def _key(result: dict) -> tuple:
+    return result["scenario"], result["rows"], result["concurrency"]
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff two benchmark result files")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Flag p95 regressions above this percentage")
+    args = parser.parse_args(argv)
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    old = {_key(r): r for r in before["results"]}
+    regressions = 0
+    print(f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}")
+    print(f"{'scenario':<22} {'rows':>8} {'c':>4} {'rps':>20} {'p95 ms':>22}")
+    for result in after["results"]:
+        previous = old.get(_key(result))
+        if previous is None or not result.get("requests") or not previous.get("requests"):
+            continue
+        p95_change = (result["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100 if previous["p95_ms"] else 0.0
+        flag = "  <-- regression" if p95_change > args.threshold else ""
+        regressions += bool(flag)
+        print(
+            f"{result['scenario']:<22} {result['rows']:>8} {result['concurrency']:>4} "
+            f"{previous['rps']:>8.1f} {_change(previous['rps'], result['rps']):>11} "
+            f"{previous['p95_ms']:>9.2f} {_change(previous['p95_ms'], result['p95_ms']):>11}{flag}"
+        )
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
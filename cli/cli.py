@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
 import sys
-import time
+import threading
 import requests
 import json
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from rich.console import Console
 from rich.panel import Panel
-from rich.prompt import Prompt, Confirm
+from rich.prompt import Prompt, Confirm, IntPrompt
 from rich.text import Text
 from rich.table import Table
 from rich.progress import Progress
@@ -24,6 +29,22 @@ API_HOST = os.getenv("API_HOST", "127.0.0.1")
 API_PORT = os.getenv("API_PORT", "8000")
 API_URL = f"http://{API_HOST}:{API_PORT}/api/items"
 
+# HTTP client settings: seconds to connect and to wait for a response,
+# and how often idempotent requests are retried on connection errors or 502/503/504
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", 3.05))
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", 30))
+API_RETRIES = int(os.getenv("API_RETRIES", 3))
+
+# Requests run in parallel by the batch commands (get, create, update, delete)
+API_CONCURRENCY = int(os.getenv("API_CONCURRENCY", 8))
+# IDs per bulk request when deleting ranges
+BULK_BATCH_SIZE = 1000
+
+# Item browser: rows per page, pages fetched ahead in the background, pages kept in memory
+PAGE_SIZE = 10
+PREFETCH_PAGES = int(os.getenv("PREFETCH_PAGES", 3))
+PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", 50))
+
 # ASCII art banner for CRUD CLI
 CRUD_CLI_BANNER = r"""
 [bold magenta]
@@ -43,9 +64,210 @@ CRUD_CLI_BANNER = r"""
 [/bold magenta]
 """
 
+class ApiSession(requests.Session):
+    """
+    Keep-alive HTTP session for the API.
+    
+    Connections are pooled and reused across operations, every request gets
+    a default timeout, and idempotent requests (GET, PUT, DELETE) are retried
+    with backoff. POST is never retried, so creates cannot be duplicated.
+    Compressed responses are decoded transparently.
+    """
+    
+    def __init__(self, timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT), retries=API_RETRIES):
+        super().__init__()
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.25,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=max(16, API_CONCURRENCY))
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+    
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+class PageError(Exception):
+    """The API answered a page request with an error status."""
+
+class PageCache:
+    """
+    Pages of the item list, fetched ahead of the reader on background threads.
+    
+    Reading a page schedules the next `prefetch` pages, so by the time the
+    user asks for them they are usually already in memory. At most
+    `max_pages` pages are kept; the least recently read are dropped first.
+    
+    A page right after a cached one is fetched with that page's cursor.
+    Pages reached by jumping are fetched by offset, counting from whichever
+    end of the table is closer, so the last page costs as little as the first.
+    """
+    
+    def __init__(self, session: requests.Session, api_url: str, page_size: int = PAGE_SIZE,
+                 prefetch: int = PREFETCH_PAGES, max_pages: int = PAGE_CACHE_SIZE):
+        self.session = session
+        self.api_url = api_url
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.max_pages = max(max_pages, prefetch + 1)
+        self.total: Optional[int] = None
+        self._pages: "OrderedDict[int, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        # FIFO: a page's predecessor is always started (or fetched inline) before it,
+        # so waiting on it cannot deadlock
+        self._executor = ThreadPoolExecutor(max_workers=2)
+    
+    def refresh_count(self) -> Optional[int]:
+        """Fetch the total number of items; None if the server cannot tell"""
+        try:
+            response = self.session.get(f"{self.api_url}count")
+            self.total = response.json()["count"] if response.status_code == 200 else None
+        except (requests.RequestException, ValueError, KeyError):
+            self.total = None
+        return self.total
+    
+    @property
+    def last_page(self) -> Optional[int]:
+        if self.total is None:
+            return None
+        return max((self.total + self.page_size - 1) // self.page_size, 1)
+    
+    def get(self, page: int) -> List[Dict[str, Any]]:
+        """Return the items on a page (1-based), waiting for it if it is not fetched yet"""
+        future, previous, is_new = self._register(page)
+        for ahead in range(page + 1, page + 1 + self.prefetch):
+            if self.last_page is not None and ahead > self.last_page:
+                break
+            self._submit(ahead)
+        
+        if is_new:
+            # Fetch the page the user is waiting for right here, not behind queued prefetches
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self._fetch(page, previous))
+            except Exception as e:
+                future.set_exception(e)
+        
+        try:
+            items, _ = future.result()
+        except Exception:
+            # Let the next attempt fetch the page again
+            with self._lock:
+                if self._pages.get(page) is future:
+                    del self._pages[page]
+            raise
+        return items
+    
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _register(self, page: int) -> Tuple[Future, Optional[Future], bool]:
+        """Get or create the future for a page; returns it, its predecessor's and whether it is new"""
+        with self._lock:
+            future = self._pages.get(page)
+            is_new = future is None
+            previous = self._pages.get(page - 1)
+            if is_new:
+                future = self._pages[page] = Future()
+            self._pages.move_to_end(page)
+            while len(self._pages) > self.max_pages:
+                _, evicted = self._pages.popitem(last=False)
+                evicted.cancel()
+            return future, previous, is_new
+    
+    def _submit(self, page: int):
+        """Fetch a page in the background unless it is already cached or on its way"""
+        future, previous, is_new = self._register(page)
+        if is_new:
+            self._executor.submit(self._prefetch, future, page, previous)
+    
+    def _prefetch(self, future: Future, page: int, previous: Optional[Future]):
+        # Cancelled when the page was evicted before the fetch started
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(self._fetch(page, previous))
+        except Exception as e:
+            future.set_exception(e)
+    
+    def _fetch(self, page: int, previous: Optional[Future]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Fetch one page; returns its items and the cursor of the page after it (if known)"""
+        if previous is not None and not previous.cancelled():
+            try:
+                previous_items, cursor = previous.result()
+            except Exception:
+                previous_items, cursor = None, None
+            if previous_items is not None and len(previous_items) < self.page_size:
+                # The previous page was the last one
+                return [], None
+            if cursor:
+                return self._request({"limit": self.page_size, "cursor": cursor})
+        
+        skip = (page - 1) * self.page_size
+        if self.total is not None:
+            if skip >= self.total:
+                return [], None
+            from_end = self.total - page * self.page_size
+            if from_end < skip:
+                # Read the page backwards from the end of the table, then restore ID order
+                limit = self.page_size + min(from_end, 0)
+                items, _ = self._request({"limit": limit, "skip": max(from_end, 0), "sort": "desc"})
+                return items[::-1], None
+        return self._request({"limit": self.page_size, "skip": skip})
+    
+    def _request(self, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        response = self.session.get(self.api_url, params=params)
+        if response.status_code != 200:
+            raise PageError(f"Error retrieving items: {response.status_code}")
+        return response.json(), response.headers.get("X-Next-Cursor")
+
+def parse_ids(spec: str) -> List[int]:
+    """
+    Parse an ID list such as "42", "1-500" or "1-10,15,20-25".
+
+    Args:
+        spec (str): Comma-separated IDs and inclusive ranges
+
+    Returns:
+        List[int]: IDs in the order given, without duplicates
+    """
+    ids = []
+    for part in spec.split(","):
+        start, _, end = part.strip().partition("-")
+        first, last = int(start), int(end or start)
+        if first > last:
+            raise ValueError(f"Invalid range: {part}")
+        ids.extend(range(first, last + 1))
+    return list(dict.fromkeys(ids))
+
+def format_ids(ids: List[int]) -> str:
+    """Collapse IDs into ranges, e.g. [1, 2, 3, 7] -> 1-3,7"""
+    parts = []
+    for item_id in sorted(ids):
+        if parts and parts[-1][1] == item_id - 1:
+            parts[-1][1] = item_id
+        else:
+            parts.append([item_id, item_id])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in parts)
+
+def id_list(spec: str) -> List[int]:
+    """argparse type for ID lists"""
+    try:
+        return parse_ids(spec)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ID list: {spec!r}")
+
 class CrudCLI:
     def __init__(self, api_port=None):
         self.console = Console()
+        self.err_console = Console(stderr=True)
+        self.session = ApiSession()
         
         # Use custom port if provided
         API_HOST = os.getenv("API_HOST", "127.0.0.1")
@@ -55,7 +277,7 @@ class CrudCLI:
     
     def display_welcome(self):
         """Display welcome screen with ASCII art banner"""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        self.console.clear()
         self.console.print(CRUD_CLI_BANNER)
         self.console.print(Panel("[bold magenta]Welcome to CRUD CLI[/bold magenta]", 
                                  subtitle="A FastAPI & MySQL-powered CRUD Application with CLI Interface"))
@@ -65,7 +287,7 @@ class CrudCLI:
     def main_menu(self):
         """Display main menu and handle user choices"""
         while True:
-            os.system('clear' if os.name == 'posix' else 'cls')
+            self.console.clear()
             self.console.print(CRUD_CLI_BANNER)
             
             table = Table(show_header=False, box=None)
@@ -77,11 +299,12 @@ class CrudCLI:
             table.add_row("[3]", "View Single Item")
             table.add_row("[4]", "Update Item")
             table.add_row("[5]", "Delete Item")
-            table.add_row("[6]", "Exit")
+            table.add_row("[6]", "Export Items to File")
+            table.add_row("[7]", "Exit")
             
             self.console.print(table)
             
-            choice = Prompt.ask("[magenta]Select an option[/magenta]", choices=["1", "2", "3", "4", "5", "6"])
+            choice = Prompt.ask("[magenta]Select an option[/magenta]", choices=["1", "2", "3", "4", "5", "6", "7"])
             
             if choice == "1":
                 self.create_item()
@@ -94,12 +317,14 @@ class CrudCLI:
             elif choice == "5":
                 self.delete_item()
             elif choice == "6":
+                self.export_items()
+            elif choice == "7":
                 self.console.print("[magenta]Thanks for using CRUD CLI![/magenta]")
                 sys.exit(0)
     
     def create_item(self):
         """Create a new item"""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        self.console.clear()
         self.console.print(Panel("[bold magenta]Create New Item[/bold magenta]"))
         
         title = Prompt.ask("[magenta]Enter title[/magenta]")
@@ -112,14 +337,8 @@ class CrudCLI:
             "completed": completed
         }
         
-        with Progress() as progress:
-            task = progress.add_task("[magenta]Creating item...", total=100)
-            for i in range(101):
-                time.sleep(0.01)
-                progress.update(task, completed=i)
-        
         try:
-            response = requests.post(self.api_url, json=item_data)
+            response = self.session.post(self.api_url, json=item_data)
             if response.status_code == 201:
                 item = response.json()
                 self.console.print(Panel(f"[green]Item created successfully with ID: {item['id']}[/green]"))
@@ -133,84 +352,103 @@ class CrudCLI:
         input("\nPress Enter to return to main menu...")
     
     def view_all_items(self):
-        """View all items with pagination"""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        """Browse all items page by page, with the next pages prefetched in the background"""
+        self.console.clear()
         self.console.print(Panel("[bold magenta]View All Items[/bold magenta]"))
         
-        skip = 0
-        limit = 10
+        pages = PageCache(self.session, self.api_url)
+        pages.refresh_count()
+        page = 1
         
-        while True:
-            with Progress() as progress:
-                task = progress.add_task("[magenta]Loading items...", total=100)
-                for i in range(101):
-                    time.sleep(0.005)
-                    progress.update(task, completed=i)
-            
-            try:
-                response = requests.get(f"{self.api_url}?skip={skip}&limit={limit}")
-                if response.status_code == 200:
-                    items = response.json()
-                    
-                    if not items:
+        try:
+            while True:
+                try:
+                    items = pages.get(page)
+                except (requests.RequestException, PageError) as e:
+                    self.console.print(f"[red]Error: {str(e)}[/red]")
+                    break
+                
+                if not items:
+                    if page == 1:
                         self.console.print("[yellow]No items found[/yellow]")
-                        input("\nPress Enter to return to main menu...")
-                        return
-                    
-                    table = Table(title="Items List", box=box.ROUNDED)
-                    table.add_column("ID", style="magenta", justify="right")
-                    table.add_column("Title", style="green")
-                    table.add_column("Description")
-                    table.add_column("Status", justify="center")
-                    
-                    for item in items:
-                        status = "[green]✓ Completed[/green]" if item["completed"] else "[yellow]⧖ Pending[/yellow]"
-                        table.add_row(
-                            str(item["id"]), 
-                            item["title"], 
-                            item["description"] or "-", 
-                            status
-                        )
-                    
-                    self.console.print(table)
-                    
-                    # For pagination, we need to check if there are more items
-                    if len(items) < limit:
-                        # No more items
-                        break
-                    
-                    next_page = Confirm.ask("[magenta]Next page?[/magenta]", default=True)
-                    if next_page:
-                        skip += limit
-                        continue
-                    else:
                         break
+                    # Items were deleted since the count was taken; show the page before
+                    page -= 1
+                    continue
+                
+                last_page = pages.last_page
+                title = f"Page {page} of {last_page}" if last_page else f"Page {page}"
+                if pages.total is not None:
+                    title += f" ({pages.total} items)"
+                table = self.items_table(items)
+                table.title = title
+                self.console.print(table)
+                
+                is_last = len(items) < PAGE_SIZE or (last_page is not None and page >= last_page)
+                # Jumping needs the item count to know how many pages there are
+                actions = [
+                    ("n", "next", not is_last),
+                    ("p", "previous", True),
+                    ("j", "jump to page", last_page is not None),
+                    ("f", "first", True),
+                    ("l", "last", last_page is not None),
+                    ("q", "quit", True),
+                ]
+                choices = [key for key, _, enabled in actions if enabled]
+                labels = ", ".join(f"\\[{key}]{label[1:]}" for key, label, enabled in actions if enabled)
+                choice = Prompt.ask(
+                    f"[magenta]{labels}[/magenta]",
+                    choices=choices,
+                    default="q" if is_last else "n",
+                )
+                
+                if choice == "n":
+                    page += 1
+                elif choice == "p":
+                    page = max(page - 1, 1)
+                elif choice == "f":
+                    page = 1
+                elif choice == "l":
+                    # Items may have been added or removed while browsing
+                    pages.refresh_count()
+                    page = pages.last_page or page
+                elif choice == "j":
+                    target = IntPrompt.ask(f"[magenta]Page (1-{last_page})[/magenta]", default=page)
+                    page = min(max(target, 1), last_page)
                 else:
-                    self.console.print(f"[red]Error retrieving items: {response.status_code}[/red]")
-                    if response.content:
-                        self.console.print(response.json())
                     break
-            except Exception as e:
-                self.console.print(f"[red]Error: {str(e)}[/red]")
-                break
+        finally:
+            pages.close()
         
         input("\nPress Enter to return to main menu...")
     
+    def items_table(self, items: List[Dict[str, Any]]) -> Table:
+        """Render items as a Rich table"""
+        table = Table(title="Items List", box=box.ROUNDED)
+        table.add_column("ID", style="magenta", justify="right")
+        table.add_column("Title", style="green")
+        table.add_column("Description")
+        table.add_column("Status", justify="center")
+        
+        for item in items:
+            status = "[green]✓ Completed[/green]" if item["completed"] else "[yellow]⧖ Pending[/yellow]"
+            table.add_row(
+                str(item["id"]), 
+                item["title"], 
+                item["description"] or "-", 
+                status
+            )
+        return table
+    
     def view_single_item(self):
         """View a single item by ID"""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        self.console.clear()
         self.console.print(Panel("[bold magenta]View Single Item[/bold magenta]"))
         
         item_id = int(Prompt.ask("[magenta]Enter item ID[/magenta]", default="1"))
         
-        with Progress() as progress:
-            task = progress.add_task("[magenta]Loading item...", total=100)
-            for i in range(101):
-                time.sleep(0.01)
-                progress.update(task, completed=i)
-        
         try:
-            response = requests.get(f"{self.api_url}{item_id}")
+            response = self.session.get(f"{self.api_url}{item_id}")
             if response.status_code == 200:
                 item = response.json()
                 
@@ -234,20 +472,14 @@ class CrudCLI:
     
     def update_item(self):
         """Update an existing item"""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        self.console.clear()
         self.console.print(Panel("[bold magenta]Update Item[/bold magenta]"))
         
         item_id = int(Prompt.ask("[magenta]Enter item ID to update[/magenta]", default="1"))
         
-        with Progress() as progress:
-            task = progress.add_task("[magenta]Checking item...", total=100)
-            for i in range(101):
-                time.sleep(0.005)
-                progress.update(task, completed=i)
-        
         try:
             # Get current item
-            response = requests.get(f"{self.api_url}{item_id}")
+            response = self.session.get(f"{self.api_url}{item_id}")
             if response.status_code != 200:
                 self.console.print(f"[red]Item with ID {item_id} not found[/red]")
                 input("\nPress Enter to return to main menu...")
@@ -271,13 +503,7 @@ class CrudCLI:
                 "completed": completed
             }
             
-            with Progress() as progress:
-                task = progress.add_task("[magenta]Updating item...", total=100)
-                for i in range(101):
-                    time.sleep(0.01)
-                    progress.update(task, completed=i)
-            
-            update_response = requests.put(f"{self.api_url}{item_id}", json=item_data)
+            update_response = self.session.put(f"{self.api_url}{item_id}", json=item_data)
             if update_response.status_code == 200:
                 updated_item = update_response.json()
                 self.console.print(f"[green]Item {item_id} updated successfully[/green]")
@@ -293,7 +519,7 @@ class CrudCLI:
     
     def delete_item(self):
         """Delete an existing item"""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        self.console.clear()
         self.console.print(Panel("[bold magenta]Delete Item[/bold magenta]"))
         
         item_id = int(Prompt.ask("[magenta]Enter item ID to delete[/magenta]", default="1"))
@@ -305,14 +531,8 @@ class CrudCLI:
             input("\nPress Enter to return to main menu...")
             return
         
-        with Progress() as progress:
-            task = progress.add_task("[magenta]Deleting item...", total=100)
-            for i in range(101):
-                time.sleep(0.01)
-                progress.update(task, completed=i)
-        
         try:
-            response = requests.delete(f"{self.api_url}{item_id}")
+            response = self.session.delete(f"{self.api_url}{item_id}")
             if response.status_code == 204:
                 self.console.print(f"[green]Item {item_id} deleted successfully[/green]")
             else:
@@ -325,7 +545,316 @@ class CrudCLI:
         
         input("\nPress Enter to return to main menu...")
     
+    def export_items(self):
+        """Export all items to a local NDJSON or CSV file"""
+        self.console.clear()
+        self.console.print(Panel("[bold magenta]Export Items to File[/bold magenta]"))
+        
+        export_format = Prompt.ask("[magenta]Format[/magenta]", choices=["ndjson", "csv"], default="ndjson")
+        path = Prompt.ask("[magenta]Output file[/magenta]", default=f"items.{export_format}")
+        
+        try:
+            # Stream the response to disk so the export never sits in memory
+            with self.session.get(f"{self.api_url}export", params={"format": export_format}, stream=True) as response:
+                if response.status_code != 200:
+                    self.console.print(f"[red]Error exporting items: {response.status_code}[/red]")
+                else:
+                    written = 0
+                    with open(path, "wb") as f, Progress() as progress:
+                        task = progress.add_task("[magenta]Exporting items...", total=None)
+                        for chunk in response.iter_content(chunk_size=64 * 1024):
+                            f.write(chunk)
+                            written += len(chunk)
+                            progress.update(task, description=f"[magenta]Exporting items... {written / 1024:.0f} KiB")
+                    self.console.print(Panel(f"[green]Exported {written / 1024:.0f} KiB to {path}[/green]"))
+        except Exception as e:
+            self.console.print(f"[red]Error: {str(e)}[/red]")
+        
+        input("\nPress Enter to return to main menu...")
+    
+    def import_file(self, path: str, import_format: Optional[str] = None) -> int:
+        """Stream a local NDJSON or CSV file to the import endpoint"""
+        if import_format is None:
+            import_format = "csv" if path.lower().endswith(".csv") else "ndjson"
+        content_type = "text/csv" if import_format == "csv" else "application/x-ndjson"
+        
+        try:
+            total = os.path.getsize(path)
+        except OSError as e:
+            self.console.print(f"[red]Error: {str(e)}[/red]")
+            return 1
+        
+        with Progress() as progress:
+            task = progress.add_task(f"[magenta]Uploading {os.path.basename(path)}...", total=total)
+            
+            def read_blocks():
+                # Send the file in blocks so it is never held in memory
+                with open(path, "rb") as f:
+                    while block := f.read(256 * 1024):
+                        progress.advance(task, len(block))
+                        yield block
+            
+            try:
+                response = self.session.post(
+                    f"{self.api_url}import",
+                    params={"format": import_format},
+                    data=read_blocks(),
+                    headers={"Content-Type": content_type},
+                    # The server answers only after the whole file is imported
+                    timeout=(API_CONNECT_TIMEOUT, None),
+                )
+            except Exception as e:
+                self.console.print(f"[red]Error: {str(e)}[/red]")
+                return 1
+        
+        if response.status_code != 200:
+            self.console.print(f"[red]Error importing items: {response.status_code}[/red]")
+            if response.content:
+                self.console.print(response.json())
+            return 1
+        
+        result = response.json()
+        self.console.print(Panel(
+            f"[green]Accepted: {result['accepted']}[/green]\n[red]Rejected: {result['rejected']}[/red]",
+            title="Import finished",
+        ))
+        for error in result["errors"]:
+            self.console.print(f"[red]Line {error['line']}:[/red] {error['error']}")
+        if result["rejected"] > len(result["errors"]):
+            self.console.print(f"[yellow]... {result['rejected'] - len(result['errors'])} more rejected rows[/yellow]")
+        return 0 if result["rejected"] == 0 else 2
+    
+    # Batch commands: no banner, menus or prompts, so they can be scripted.
+    # They return the process exit status: 0 on success, 2 when some items
+    # were not found and 1 on errors.
+    
+    def _error(self, message: str):
+        self.err_console.print(f"[red]{message}[/red]")
+    
+    def _error_detail(self, response: requests.Response) -> str:
+        try:
+            return str(response.json().get("detail", response.status_code))
+        except ValueError:
+            return str(response.status_code)
+    
+    def _print_json(self, data):
+        # Plain print, so the output is valid JSON even when it is piped
+        print(json.dumps(data))
+    
+    def get_items_by_id(self, item_ids: List[int], as_json: bool = False) -> int:
+        """Fetch items concurrently and print them in the order requested"""
+        def fetch(item_id):
+            return self.session.get(f"{self.api_url}{item_id}")
+        
+        try:
+            with ThreadPoolExecutor(max_workers=API_CONCURRENCY) as pool:
+                responses = list(pool.map(fetch, item_ids))
+        except requests.RequestException as e:
+            self._error(f"Error: {str(e)}")
+            return 1
+        
+        items, exit_code = [], 0
+        for item_id, response in zip(item_ids, responses):
+            if response.status_code == 200:
+                items.append(response.json())
+            elif response.status_code == 404:
+                self._error(f"Item {item_id} not found")
+                exit_code = max(exit_code, 2)
+            else:
+                self._error(f"Error retrieving item {item_id}: {self._error_detail(response)}")
+                exit_code = 1
+        
+        if as_json:
+            self._print_json(items[0] if len(item_ids) == 1 and items else items)
+        elif items:
+            self.console.print(self.items_table(items))
+        return exit_code
+    
+    def list_items(self, fetch_all: bool = False, as_json: bool = False, limit: int = 100,
+                   completed: Optional[bool] = None, sort: str = "asc") -> int:
+        """Print one page of items, or every page when fetch_all is set"""
+        params: Dict[str, Any] = {"limit": limit, "sort": sort}
+        if completed is not None:
+            params["completed"] = str(completed).lower()
+        
+        items = []
+        try:
+            while True:
+                response = self.session.get(self.api_url, params=params)
+                if response.status_code != 200:
+                    self._error(f"Error retrieving items: {self._error_detail(response)}")
+                    return 1
+                items.extend(response.json())
+                # Pages are fetched one after another: each needs the previous page's cursor
+                cursor = response.headers.get("X-Next-Cursor")
+                if not fetch_all or not cursor:
+                    break
+                params["cursor"] = cursor
+        except requests.RequestException as e:
+            self._error(f"Error: {str(e)}")
+            return 1
+        
+        if as_json:
+            self._print_json(items)
+        else:
+            self.console.print(self.items_table(items))
+        return 0
+    
+    def create_items(self, titles: List[str], description: Optional[str] = None,
+                     completed: bool = False, as_json: bool = False) -> int:
+        """Create one item per title in a single bulk request"""
+        payload = [{"title": title, "description": description, "completed": completed} for title in titles]
+        try:
+            if len(payload) == 1:
+                response = self.session.post(self.api_url, json=payload[0])
+            else:
+                response = self.session.post(f"{self.api_url}bulk", json=payload)
+        except requests.RequestException as e:
+            self._error(f"Error: {str(e)}")
+            return 1
+        
+        if response.status_code != 201:
+            self._error(f"Error creating items: {self._error_detail(response)}")
+            return 1
+        created = response.json()
+        if as_json:
+            self._print_json(created)
+        else:
+            created = created if isinstance(created, list) else [created]
+            self.console.print(f"[green]Created {len(created)} item(s): {format_ids([i['id'] for i in created])}[/green]")
+        return 0
+    
+    def update_items_by_id(self, item_ids: List[int], changes: Dict[str, Any]) -> int:
+        """Apply the same field changes to every item, reading and writing concurrently"""
+        def update(item_id):
+            response = self.session.get(f"{self.api_url}{item_id}")
+            if response.status_code != 200:
+                return item_id, response
+            item = {**response.json(), **changes}
+            del item["id"]
+            # If-Match makes the write fail instead of overwriting a concurrent change
+            headers = {"If-Match": response.headers["ETag"]} if "ETag" in response.headers else {}
+            return item_id, self.session.put(f"{self.api_url}{item_id}", json=item, headers=headers)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=API_CONCURRENCY) as pool:
+                results = list(pool.map(update, item_ids))
+        except requests.RequestException as e:
+            self._error(f"Error: {str(e)}")
+            return 1
+        
+        return self._report(results, "updated", 200)
+    
+    def delete_items_by_id(self, item_ids: List[int]) -> int:
+        """Delete items through the bulk endpoint, BULK_BATCH_SIZE IDs per request"""
+        batches = [item_ids[i:i + BULK_BATCH_SIZE] for i in range(0, len(item_ids), BULK_BATCH_SIZE)]
+        
+        def delete(batch):
+            return self.session.delete(f"{self.api_url}bulk", json=batch)
+        
+        try:
+            # Batches cover disjoint IDs, so they can run in parallel
+            with ThreadPoolExecutor(max_workers=API_CONCURRENCY) as pool:
+                responses = list(pool.map(delete, batches))
+        except requests.RequestException as e:
+            self._error(f"Error: {str(e)}")
+            return 1
+        
+        results = []
+        for batch, response in zip(batches, responses):
+            if response.status_code != 200:
+                results.extend((item_id, response) for item_id in batch)
+                continue
+            for result in response.json():
+                results.append((result["id"], 404 if result["status"] == "not_found" else 204))
+        return self._report(results, "deleted", 204)
+    
+    def _report(self, results: list, action: str, ok_status: int) -> int:
+        """Summarize (item_id, response or status code) pairs and return the exit status"""
+        done, missing, exit_code = [], [], 0
+        for item_id, result in results:
+            status_code = result if isinstance(result, int) else result.status_code
+            if status_code == ok_status:
+                done.append(item_id)
+            elif status_code == 404:
+                missing.append(item_id)
+                exit_code = max(exit_code, 2)
+            else:
+                self._error(f"Item {item_id} not {action}: {self._error_detail(result)}")
+                exit_code = 1
+        
+        self.console.print(f"[green]{action.capitalize()} {len(done)} item(s)[/green]" + (f": {format_ids(done)}" if done else ""))
+        if missing:
+            self._error(f"Not found: {format_ids(missing)}")
+        return exit_code
+    
     def run(self):
         """Run the CLI application"""
         self.display_welcome()
-        self.main_menu()
\ No newline at end of file
+        self.main_menu()
+
+def main(argv=None):
+    """Run the interactive CLI, or a single command when one is given"""
+    parser = argparse.ArgumentParser(prog="python -m cli.cli", description="CRUD CLI")
+    parser.add_argument("--port", help="API port (defaults to API_PORT)")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    import_parser = subparsers.add_parser("import", help="Import items from an NDJSON or CSV file")
+    import_parser.add_argument("path", help="File to import")
+    import_parser.add_argument("--format", choices=["ndjson", "csv"], help="File format (guessed from the extension by default)")
+    
+    get_parser = subparsers.add_parser("get", help="Show items by ID")
+    get_parser.add_argument("ids", type=id_list, help="IDs and ranges, e.g. 42 or 1-10,15")
+    get_parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    
+    list_parser = subparsers.add_parser("list", help="List items")
+    list_parser.add_argument("--all", action="store_true", help="Follow cursors through every page")
+    list_parser.add_argument("--json", action="store_true", help="Print a JSON array instead of a table")
+    list_parser.add_argument("--limit", type=int, default=100, help="Items per page")
+    list_parser.add_argument("--completed", choices=["true", "false"], help="Filter by status")
+    list_parser.add_argument("--sort", choices=["asc", "desc"], default="asc", help="Sort by ID")
+    
+    create_parser = subparsers.add_parser("create", help="Create items, one per title")
+    create_parser.add_argument("titles", nargs="+", help="Item titles")
+    create_parser.add_argument("--description", help="Description for every new item")
+    create_parser.add_argument("--completed", action="store_true", help="Mark the new items completed")
+    create_parser.add_argument("--json", action="store_true", help="Print the created items as JSON")
+    
+    update_parser = subparsers.add_parser("update", help="Change fields of items by ID")
+    update_parser.add_argument("ids", type=id_list, help="IDs and ranges, e.g. 42 or 1-10,15")
+    update_parser.add_argument("--title")
+    update_parser.add_argument("--description")
+    status_group = update_parser.add_mutually_exclusive_group()
+    status_group.add_argument("--completed", dest="completed", action="store_const", const=True)
+    status_group.add_argument("--pending", dest="completed", action="store_const", const=False)
+    
+    delete_parser = subparsers.add_parser("delete", help="Delete items by ID")
+    delete_parser.add_argument("ids", type=id_list, help="IDs and ranges, e.g. 42 or 1-500")
+    
+    args = parser.parse_args(argv)
+    cli = CrudCLI(api_port=args.port)
+    
+    if args.command == "import":
+        sys.exit(cli.import_file(args.path, args.format))
+    if args.command == "get":
+        sys.exit(cli.get_items_by_id(args.ids, as_json=args.json))
+    if args.command == "list":
+        completed = None if args.completed is None else args.completed == "true"
+        sys.exit(cli.list_items(args.all, args.json, args.limit, completed, args.sort))
+    if args.command == "create":
+        sys.exit(cli.create_items(args.titles, args.description, args.completed, as_json=args.json))
+    if args.command == "update":
+        changes = {
+            field: value
+            for field, value in (("title", args.title), ("description", args.description), ("completed", args.completed))
+            if value is not None
+        }
+        if not changes:
+            parser.error("update needs at least one of --title, --description, --completed, --pending")
+        sys.exit(cli.update_items_by_id(args.ids, changes))
+    if args.command == "delete":
+        sys.exit(cli.delete_items_by_id(args.ids))
+    cli.run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import os
+import sys
+import tempfile
+
+# Settings are read when app modules are imported, so set them first
+_data_dir = tempfile.mkdtemp(prefix="crud-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_data_dir, 'items.db')}"
+os.environ["LOG_REQUESTS"] = "false"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DB_SHARD_URLS", None)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+@pytest.fixture
+def memory_cache():
+    """Swap in an empty in-process item cache for one test"""
+    import app.cache as cache
+    previous = cache.item_cache
+    cache.item_cache = cache.MemoryCache()
+    yield cache.item_cache
+    cache.item_cache = previous
+
+@pytest.fixture
+def client():
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,26 @@
+import asyncio
+from app.batcher import CreateBatcher
+from app.schemas.item import ItemCreate
+
+def test_unexpected_write_error_fails_every_caller_in_the_batch(monkeypatch):
+    batcher = CreateBatcher(max_size=10, max_delay=0.01)
+
+    async def broken_write(items):
+        raise RuntimeError("driver crashed")
+
+    monkeypatch.setattr(batcher, "_write", broken_write)
+
+    async def main():
+        batcher.start()
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.submit(ItemCreate(title=f"Item {n}")) for n in range(3)),
+                               return_exceptions=True),
+                timeout=5,
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(main())
+    assert len(results) == 3
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+import pytest
+import app.crud.bulk as bulk
+from app.schemas.item import ItemCreate
+
+class FakeEngine:
+    dialect = SimpleNamespace(name="mysql")
+
+class FakeMySQLSession:
+    """Answers the AUTO_INCREMENT settings query and hands out IDs like MySQL would"""
+
+    def __init__(self, increment: int, lock_mode: int):
+        self.engine = FakeEngine()
+        self.settings = (increment, lock_mode)
+        self.increment = increment
+        self.next_id = 1
+        self.inserts = []
+
+    def get_bind(self):
+        return self.engine
+
+    def execute(self, statement, params=None, **kwargs):
+        if "@@auto_increment_increment" in str(statement):
+            return SimpleNamespace(fetchone=lambda: self.settings)
+        rows = sum(1 for name in params if name.startswith("title_"))
+        self.inserts.append(rows)
+        result = SimpleNamespace(lastrowid=self.next_id)
+        self.next_id += rows * self.increment
+        return result
+
+    def commit(self):
+        pass
+
+@pytest.fixture(autouse=True)
+def fresh_settings(monkeypatch):
+    monkeypatch.setattr(bulk, "_id_steps", {})
+
+def test_ids_follow_auto_increment_increment():
+    db = FakeMySQLSession(increment=2, lock_mode=1)
+    created = bulk.create_items(db, [ItemCreate(title=f"Item {n}") for n in range(3)])
+    assert [item.id for item in created] == [1, 3, 5]
+    assert db.inserts == [3]
+
+def test_interleaved_lock_mode_inserts_one_row_per_statement():
+    db = FakeMySQLSession(increment=1, lock_mode=2)
+    created = bulk.create_items(db, [ItemCreate(title=f"Item {n}") for n in range(3)])
+    assert [item.id for item in created] == [1, 2, 3]
+    assert db.inserts == [1, 1, 1]
@@ -0,0 +1,41 @@
+def test_post_etag_is_accepted_by_put_if_match(client):
+    created = client.post("/api/items/", json={"title": "Milk", "completed": False})
+    assert created.status_code == 201
+
+    response = client.put(
+        f"/api/items/{created.json()['id']}",
+        json={"title": "Oat milk", "completed": True},
+        headers={"If-Match": created.headers["ETag"]},
+    )
+    assert response.status_code == 200
+
+    # The row now read back from the database must match the PUT's ETag too
+    response = client.put(
+        f"/api/items/{created.json()['id']}",
+        json={"title": "Oat milk", "completed": False},
+        headers={"If-Match": response.headers["ETag"]},
+    )
+    assert response.status_code == 200
+
+def test_cached_get_etag_is_accepted_by_put_if_match(client, memory_cache):
+    created = client.post("/api/items/", json={"title": "Eggs", "completed": True})
+    fetched = client.get(f"/api/items/{created.json()['id']}")
+    assert fetched.headers["ETag"] == created.headers["ETag"]
+
+    response = client.put(
+        f"/api/items/{created.json()['id']}",
+        json={"title": "Eggs", "completed": False},
+        headers={"If-Match": fetched.headers["ETag"]},
+    )
+    assert response.status_code == 200
+
+def test_stale_if_match_is_rejected(client):
+    created = client.post("/api/items/", json={"title": "Bread"})
+    client.put(f"/api/items/{created.json()['id']}", json={"title": "Rye bread"})
+
+    response = client.put(
+        f"/api/items/{created.json()['id']}",
+        json={"title": "Toast"},
+        headers={"If-Match": created.headers["ETag"]},
+    )
+    assert response.status_code == 412
@@ -0,0 +1,31 @@
+def test_ndjson_line_that_is_not_utf8_is_rejected(client):
+    body = b'{"title": "First"}\n{"title": "Caf\xe9"}\n{"title": "Third"}\n'
+
+    response = client.post("/api/items/import?format=ndjson", content=body)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["accepted"], result["rejected"]) == (2, 1)
+    assert result["errors"] == [{"line": 2, "error": "Invalid UTF-8"}]
+
+def test_csv_record_that_is_not_utf8_is_rejected(client):
+    body = b'title,description,completed\nFirst,,false\n"Two\nlines \xff",,false\nThird,,true\n'
+
+    response = client.post("/api/items/import?format=csv", content=body)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["accepted"], result["rejected"]) == (2, 1)
+    assert result["errors"] == [{"line": 3, "error": "Invalid UTF-8 on line 4"}]
+
+def test_rows_longer_than_the_columns_are_rejected(client):
+    body = "\n".join([
+        '{"title": "First"}',
+        '{"title": "%s"}' % ("x" * 256),
+        '{"title": "Third", "description": "%s"}' % ("y" * 1001),
+        '{"title": "Fourth"}',
+    ])
+
+    response = client.post("/api/items/import?format=ndjson", content=body)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["accepted"], result["rejected"]) == (2, 2)
+    assert [error["line"] for error in result["errors"]] == [2, 3]
@@ -0,0 +1,18 @@
+import pytest
+import app.routes.item as item_routes
+
+@pytest.fixture
+def small_pages(monkeypatch):
+    monkeypatch.setattr(item_routes, "MAX_PAGE_SIZE", 5)
+
+def test_limit_is_capped_at_max_page_size(client, small_pages):
+    client.post("/api/items/bulk", json=[{"title": f"Item {n}"} for n in range(8)])
+
+    response = client.get("/api/items/", params={"limit": 1000})
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+    assert "X-Next-Cursor" in response.headers
+
+@pytest.mark.parametrize("params", [{"limit": -1}, {"limit": 0}, {"skip": -1}])
+def test_out_of_range_paging_is_rejected(client, small_pages, params):
+    assert client.get("/api/items/", params=params).status_code == 422
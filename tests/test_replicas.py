@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import create_engine, text
+from app.database import Base
+from app.replicas import ReplicaSet, RoutingSession
+import app.crud.read as read
+import app.models.item  # noqa: F401  (registers the items table)
+
+@pytest.fixture
+def lagging_replica(tmp_path):
+    """A primary and a replica that still has the item's old title"""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, title in ((primary, "New"), (replica, "Old")):
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            connection.execute(
+                text("INSERT INTO items (id, title, completed) VALUES (1, :title, 0)"), {"title": title}
+            )
+    yield primary, ReplicaSet([replica])
+    primary.dispose()
+    replica.dispose()
+
+def test_rows_read_from_a_replica_are_not_cached(lagging_replica, memory_cache):
+    primary, replicas = lagging_replica
+    with RoutingSession(bind=primary, replicas=replicas) as db:
+        assert read.get_item(db, 1).title == "Old"
+    assert memory_cache.get(1) is None
+
+    with RoutingSession(bind=primary, replicas=replicas, read_primary=True) as db:
+        assert read.get_item(db, 1).title == "New"
+    assert memory_cache.get(1)["title"] == "New"
+
+def test_read_primary_skips_the_cache(lagging_replica, memory_cache):
+    primary, replicas = lagging_replica
+    memory_cache.set(1, {"id": 1, "title": "Stale", "description": None, "completed": False})
+
+    with RoutingSession(bind=primary, replicas=replicas, read_primary=True) as db:
+        assert read.get_item(db, 1).title == "New"
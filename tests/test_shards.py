@@ -0,0 +1,51 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy import create_engine, text
+from app.ids import SnowflakeGenerator
+from app.shards import LEGACY_ID_LIMIT, ShardRouter
+
+@pytest.fixture
+def engines():
+    engines = [create_engine("sqlite://") for _ in range(3)]
+    yield engines
+    for engine in engines:
+        engine.dispose()
+
+def test_ids_from_before_sharding_stay_on_shard_0(engines):
+    router = ShardRouter(engines)
+    assert {router.shard_for(item_id) for item_id in range(1, 10000)} == {0}
+    assert router.shard_for(LEGACY_ID_LIMIT - 1) == 0
+
+def test_snowflake_ids_are_spread_over_every_shard(engines):
+    router = ShardRouter(engines)
+    ids = SnowflakeGenerator(worker_id=1).next_ids(300)
+    assert set(router.group(ids)) == {0, 1, 2}
+
+def test_legacy_ids_up_to_the_configured_max_stay_on_shard_0(engines):
+    router = ShardRouter(engines, legacy_max_id=6_000_000)
+    assert {router.shard_for(item_id) for item_id in range(LEGACY_ID_LIMIT, 6_000_001, 997)} == {0}
+    assert router.shard_for(5_000_000) == 0
+
+def test_legacy_max_id_must_be_below_new_snowflake_ids(engines):
+    with pytest.raises(ValueError):
+        ShardRouter(engines, legacy_max_id=SnowflakeGenerator().next_id())
+
+def test_range_bounds_below_legacy_ids_are_rejected(engines):
+    with pytest.raises(ValueError):
+        ShardRouter(engines, "range", [1000, LEGACY_ID_LIMIT * 2])
+    with pytest.raises(ValueError):
+        ShardRouter(engines, "range", [5_000_000, LEGACY_ID_LIMIT * 4], legacy_max_id=6_000_000)
+
+def test_concurrent_fan_outs_run_in_parallel(engines):
+    router = ShardRouter(engines, max_workers=len(engines) * 4)
+    barrier = threading.Barrier(len(engines) * 4, timeout=5)
+
+    def query(connection):
+        # Only passes once all four fan-outs have a query running on every shard
+        barrier.wait()
+        return connection.execute(text("SELECT 1")).scalar()
+
+    with ThreadPoolExecutor(max_workers=4) as callers:
+        results = list(callers.map(lambda _: router.fan_out(None, query), range(4)))
+    assert results == [[1, 1, 1]] * 4
@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+from fastapi.testclient import TestClient
+from app.main import app
+with TestClient(app) as client:
+    assert client.post("/api/items/", json={"title": "Milk"}).status_code == 201
+"""
+
+def test_async_sqlite_worker_exits_after_shutdown(tmp_path):
+    # DB_ASYNC is read at import, so the app runs in its own process
+    env = dict(
+        os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'items.db'}", DB_ASYNC="true", LOG_REQUESTS="false",
+    )
+    # Without the engines disposed, aiosqlite's connection thread keeps the process alive
+    subprocess.run([sys.executable, "-c", SCRIPT], cwd=ROOT, env=env, check=True, timeout=60)
@@ -0,0 +1,29 @@
+import asyncio
+from app.replicas import RoutingSession
+from app.singleflight import SingleFlight, read_key
+
+def test_primary_pinned_reads_are_not_coalesced():
+    assert read_key(RoutingSession(read_primary=True), "get_item", kwargs={"item_id": 1}) is None
+
+def test_replica_and_primary_reads_get_different_keys():
+    replica_read = read_key(RoutingSession(replicas=object()), "get_item", kwargs={"item_id": 1})
+    primary_read = read_key(RoutingSession(), "get_item", kwargs={"item_id": 1})
+    assert None not in (replica_read, primary_read)
+    assert replica_read != primary_read
+
+def test_locking_reads_are_not_coalesced():
+    assert read_key(RoutingSession(), "get_item", kwargs={"item_id": 1, "for_update": True}) is None
+
+def test_concurrent_identical_calls_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def query():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async(("get_item", 1), query) for _ in range(10)))
+
+    assert asyncio.run(main()) == [1] * 10
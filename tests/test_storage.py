@@ -0,0 +1,14 @@
+import pytest
+from app.storage import ItemStorage, MemoryStorage, SQLStorage
+
+def test_incomplete_backend_cannot_be_instantiated():
+    class GetOnlyStorage(ItemStorage):
+        def get_item(self, db, item_id, for_update=False):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnlyStorage()
+
+def test_builtin_backends_implement_every_operation():
+    SQLStorage("sqlite")
+    MemoryStorage()